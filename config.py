@@ -25,6 +25,13 @@ class Config:
     CHROMA_DB_PATH: str = os.getenv("CHROMA_DB_PATH", "./chroma_db")
     CHROMA_COLLECTION_EVENTS: str = os.getenv("CHROMA_COLLECTION_EVENTS", "city_events")
     CHROMA_COLLECTION_USERS: str = os.getenv("CHROMA_COLLECTION_USERS", "user_preferences")
+    # Similarity search backend: "chroma", or "faiss" for an in-memory FAISS mirror of the events collection
+    VECTOR_BACKEND: str = os.getenv("CITYPULSE_VECTOR_BACKEND", "chroma")
+    # Set to "int8" to store the FAISS mirror's vectors scalar-quantized (4x smaller than float32)
+    VECTOR_QUANTIZATION: str = os.getenv("CITYPULSE_VECTOR_QUANTIZATION", "none")
+    # Embedding backend: "gemini" (embedding-001, 768-dim) or "local" (sentence-transformers model below)
+    EMBEDDING_BACKEND: str = os.getenv("CITYPULSE_EMBEDDING_BACKEND", "gemini")
+    LOCAL_EMBEDDING_MODEL: str = os.getenv("LOCAL_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
     
     # Redis Configuration
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
@@ -26,6 +26,31 @@ from config import config
 
 logger = logging.getLogger(__name__)
 
+# Conversation history kept per user (in messages). History is append-only
+# until it exceeds twice the window, then rolls back to the last window, so the
+# history section of consecutive prompts shares a stable prefix.
+CONVERSATION_WINDOW = 4
+
+# Static part of the conversation prompt. It leads every prompt so all users
+# and turns share the same prefix.
+CONVERSATION_INSTRUCTIONS = """
+            You are the City Pulse AI Assistant - a helpful, knowledgeable city guide for Bengaluru.
+            
+            Instructions:
+            - Provide helpful, conversational responses with actionable information
+            - Use the local information from our knowledge base when relevant
+            - Be specific to Bengaluru context (mention areas like MG Road, HSR Layout, Electronic City, ORR, etc.)
+            - Give practical recommendations (alternative routes, timings, preparations)
+            - Keep responses natural and friendly
+            - If asking about traffic, weather, or local events, use the provided local information
+            
+            Response Guidelines:
+            - Start with direct answer to user's question
+            - Include specific local details from the knowledge base if relevant
+            - End with helpful suggestion or follow-up question
+            - Keep response conversational (2-4 sentences)
+            """
+
 
 class CityPulseAgenticLayer:
     """
@@ -37,6 +62,8 @@ class CityPulseAgenticLayer:
         self.model = None
         self.conversation_sessions = {}  # Track ongoing conversations
         self.user_contexts = {}  # Cache user contexts
+        self.dashboard_cache = {}  # Cache generated dashboard cards
+        self.pending_dashboards = {}  # In-flight dashboard generations per user
         self._initialize_gemini()
     
     def _initialize_gemini(self):
@@ -56,7 +83,22 @@ class CityPulseAgenticLayer:
     # CORE AGENTIC FUNCTIONS
     # =========================================================================
     
-    async def generate_dashboard_content(self, user_id: str) -> List[Dict[str, Any]]:
+    async def generate_dashboard_content(self, user_id: str, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Generate proactive dashboard cards for user, reusing recent or in-flight results"""
+        # Check cache first (5 minute cache)
+        cached = self.dashboard_cache.get(user_id)
+        if cached and not refresh and (datetime.utcnow() - cached['_cached_at']).total_seconds() < 300:
+            return cached['cards']
+        
+        # Concurrent requests for the same user (e.g. a prefetch) share one generation
+        pending = self.pending_dashboards.get(user_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._build_dashboard_content(user_id))
+            self.pending_dashboards[user_id] = pending
+            pending.add_done_callback(lambda _: self.pending_dashboards.pop(user_id, None))
+        return await asyncio.shield(pending)
+    
+    async def _build_dashboard_content(self, user_id: str) -> List[Dict[str, Any]]:
         """Generate proactive dashboard cards for user"""
         try:
             # Get user context
@@ -118,6 +160,7 @@ class CityPulseAgenticLayer:
             
             # Parse cards from response
             cards = self._parse_dashboard_cards(response.text, user_context)
+            self.dashboard_cache[user_id] = {"cards": cards, "_cached_at": datetime.utcnow()}
             
             logger.info(f"Generated {len(cards)} dashboard cards for user {user_id}")
             return cards
@@ -155,10 +198,9 @@ class CityPulseAgenticLayer:
                     max_results=3
                 )
             
-            # Build comprehensive conversation prompt
-            conversation_prompt = f"""
-            You are the City Pulse AI Assistant - a helpful, knowledgeable city guide for Bengaluru.
-            
+            # Build comprehensive conversation prompt: shared instructions first,
+            # then the user-specific and per-turn sections
+            conversation_prompt = f"""{CONVERSATION_INSTRUCTIONS}
             User Profile:
             - Name: {user_context.get('name', 'User')}
             - Interests: {user_context.get('preferred_topics', [])}
@@ -166,26 +208,12 @@ class CityPulseAgenticLayer:
             {location_context}
             
             Recent Conversation:
-            {self._format_conversation_history(conversation_history[-3:])}
+            {self._format_conversation_history(conversation_history)}
             
             Relevant Local Information:
             {json.dumps(knowledge_results, indent=2) if knowledge_results else "No specific local incidents found"}
             
             User's Current Message: "{message}"
-            
-            Instructions:
-            - Provide helpful, conversational responses with actionable information
-            - Use the local information from our knowledge base when relevant
-            - Be specific to Bengaluru context (mention areas like MG Road, HSR Layout, Electronic City, ORR, etc.)
-            - Give practical recommendations (alternative routes, timings, preparations)
-            - Keep responses natural and friendly
-            - If asking about traffic, weather, or local events, use the provided local information
-            
-            Response Guidelines:
-            - Start with direct answer to user's question
-            - Include specific local details from the knowledge base if relevant
-            - End with helpful suggestion or follow-up question
-            - Keep response conversational (2-4 sentences)
             """
             
             # Generate response
@@ -273,7 +301,7 @@ class CityPulseAgenticLayer:
             # Check cache first (5 minute cache)
             if user_id in self.user_contexts:
                 cached_time = self.user_contexts[user_id].get('_cached_at')
-                if cached_time and (datetime.utcnow() - cached_time).seconds < 300:
+                if cached_time and (datetime.utcnow() - cached_time).total_seconds() < 300:
                     return self.user_contexts[user_id]
             
             # Get user profile
@@ -425,8 +453,9 @@ class CityPulseAgenticLayer:
             {"role": "assistant", "content": ai_response, "timestamp": datetime.utcnow().isoformat()}
         ])
         
-        # Keep only last 10 messages
-        self.conversation_sessions[user_id] = self.conversation_sessions[user_id][-10:]
+        # Roll the window over only once it has grown past twice its size
+        if len(self.conversation_sessions[user_id]) > 2 * CONVERSATION_WINDOW:
+            self.conversation_sessions[user_id] = self.conversation_sessions[user_id][-CONVERSATION_WINDOW:]
     
     def _format_conversation_history(self, history: List[Dict]) -> str:
         """Format conversation history for prompt"""
@@ -7,6 +7,7 @@ Provides conversational AI and dashboard content generation
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Path
 from fastapi.responses import JSONResponse
 from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -33,10 +34,18 @@ class AgentChatRequest(BaseModel):
     location: Optional[Coordinates] = Field(None, description="User's current location")
     session_context: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Session context")
 
+class AgentChatBatchRequest(BaseModel):
+    user_id: str = Field(..., description="User ID for personalization")
+    messages: List[str] = Field(..., min_length=1, max_length=10, description="Messages to send, in conversation order")
+    location: Optional[Coordinates] = Field(None, description="User's current location")
+
 class DashboardRequest(BaseModel):
     user_id: str = Field(..., description="User ID for personalization")
     refresh: bool = Field(False, description="Force refresh dashboard content")
 
+class DashboardPrefetchRequest(BaseModel):
+    user_ids: List[str] = Field(..., min_length=1, max_length=20, description="Users whose dashboards to precompute")
+
 class InsightsRequest(BaseModel):
     user_id: str = Field(..., description="User ID")
     insight_type: str = Field("general", description="Type of insights (general, traffic, weather, events)")
@@ -50,6 +59,11 @@ class AgentResponse(BaseModel):
     knowledge_used: int = 0
     timestamp: str
 
+class AgentChatBatchResponse(BaseModel):
+    success: bool
+    responses: List[AgentResponse]
+    total_messages: int
+
 class DashboardResponse(BaseModel):
     success: bool
     cards: List[Dict[str, Any]]
@@ -105,6 +119,50 @@ async def chat_with_agent(
         logger.error(f"Error in agent chat: {e}")
         raise HTTPException(status_code=500, detail=f"Agent chat failed: {str(e)}")
 
+@router.post("/chat/batch", response_model=AgentChatBatchResponse)
+async def chat_with_agent_batch(
+    request: AgentChatBatchRequest,
+    background_tasks: BackgroundTasks
+):
+    """Handle several conversation turns for one user in a single request"""
+    try:
+        logger.info(f"Agent batch chat request from user {request.user_id}: {len(request.messages)} messages")
+        
+        responses = []
+        # Turns are handled in order so each one sees the previous turns' context
+        for message in request.messages:
+            result = await city_pulse_agent.handle_conversation(
+                user_id=request.user_id,
+                message=message,
+                location=request.location
+            )
+            
+            background_tasks.add_task(
+                track_agent_interaction, 
+                request.user_id, 
+                message, 
+                result.get("response", "")
+            )
+            
+            responses.append(AgentResponse(
+                success=True,
+                response=result.get("response", ""),
+                suggested_actions=result.get("suggested_actions", []),
+                conversation_id=result.get("conversation_id", ""),
+                knowledge_used=result.get("knowledge_used", 0),
+                timestamp=result.get("timestamp", datetime.utcnow().isoformat())
+            ))
+        
+        return AgentChatBatchResponse(
+            success=True,
+            responses=responses,
+            total_messages=len(responses)
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in agent batch chat: {e}")
+        raise HTTPException(status_code=500, detail=f"Agent batch chat failed: {str(e)}")
+
 @router.post("/dashboard", response_model=DashboardResponse)
 async def generate_dashboard(
     request: DashboardRequest,
@@ -115,7 +173,7 @@ async def generate_dashboard(
         logger.info(f"Dashboard generation request for user {request.user_id}")
         
         # Generate dashboard content using agentic layer
-        cards = await city_pulse_agent.generate_dashboard_content(request.user_id)
+        cards = await city_pulse_agent.generate_dashboard_content(request.user_id, refresh=request.refresh)
         
         # Add background task to track dashboard usage
         background_tasks.add_task(track_dashboard_generation, request.user_id, len(cards))
@@ -132,6 +190,26 @@ async def generate_dashboard(
         logger.error(f"Error generating dashboard: {e}")
         raise HTTPException(status_code=500, detail=f"Dashboard generation failed: {str(e)}")
 
+@router.post("/prefetch")
+async def prefetch_dashboards(request: DashboardPrefetchRequest):
+    """Precompute dashboard cards so later dashboard requests are served from cache"""
+    try:
+        logger.info(f"Dashboard prefetch request for {len(request.user_ids)} users")
+        
+        card_lists = await asyncio.gather(*(
+            city_pulse_agent.generate_dashboard_content(user_id) for user_id in request.user_ids
+        ))
+        
+        return {
+            "success": True,
+            "prefetched": {user_id: len(cards) for user_id, cards in zip(request.user_ids, card_lists)},
+            "generated_at": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error prefetching dashboards: {e}")
+        raise HTTPException(status_code=500, detail=f"Dashboard prefetch failed: {str(e)}")
+
 @router.post("/insights", response_model=InsightsResponse)
 async def get_personalized_insights(
     request: InsightsRequest
@@ -196,6 +274,7 @@ async def reset_conversation(
         # Clear user context cache
         if user_id in city_pulse_agent.user_contexts:
             del city_pulse_agent.user_contexts[user_id]
+        city_pulse_agent.dashboard_cache.pop(user_id, None)
         
         return {
             "success": True,
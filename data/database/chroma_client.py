@@ -1,13 +1,30 @@
 import chromadb
 from chromadb.config import Settings
 from typing import List, Dict, Any, Optional, Tuple
+import copy
 import json
 import logging
+import hashlib
+import time
+from collections import OrderedDict
 import google.generativeai as genai
 from datetime import datetime
+import numpy as np
 import sys
 import os
 
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
 # Add parent directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import config
@@ -15,6 +32,21 @@ from data.models.schemas import Event, EventTopic, Coordinates
 
 logger = logging.getLogger(__name__)
 
+# Query embeddings are memoized (LRU with TTL) so repeated searches skip the embedding call
+QUERY_EMBEDDING_CACHE_SIZE = 256
+QUERY_EMBEDDING_CACHE_TTL = 3600  # seconds
+
+# Searches whose query embedding is this cosine-similar to a cached search (same
+# location, topic and limit) reuse its results until the next event is added
+SIMILAR_QUERY_THRESHOLD = 0.97
+SEARCH_RESULT_CACHE_SIZE = 1000
+
+# Minimum stored events needed to train the int8 quantizer's per-dimension ranges
+INT8_MIN_TRAINING_VECTORS = 256
+
+# Events per embedding call / collection.add() when bulk-loading (Gemini's batch embed limit)
+EVENT_BATCH_SIZE = 100
+
 class ChromaDBClient:
     """ChromaDB client for vector similarity search and embeddings"""
     
@@ -22,8 +54,34 @@ class ChromaDBClient:
         self.client = None
         self.events_collection = None
         self.users_collection = None
+        self.query_embedding_cache = OrderedDict()  # sha256(query) -> (embedding, cached_at)
+        # Search result cache: a ring buffer of unit query vectors, preallocated on
+        # first use, with (search params, results) for each row
+        self.search_cache_vectors = None
+        self.search_cache_entries = [None] * SEARCH_RESULT_CACHE_SIZE
+        self.search_cache_size = 0
+        self.search_cache_next = 0
+        self.faiss_index = None  # Optional read mirror of events_collection
+        self.faiss_records = []  # (event_id, document, metadata) per FAISS row
+        self.embedder = None  # Local sentence-transformers model, when that backend is selected
+        self._initialize_embedder()
         self._initialize_chroma()
         self._initialize_gemini()
+        self._initialize_faiss()
+    
+    def _initialize_embedder(self):
+        """Load the local embedding model once per process when that backend is selected"""
+        if config.EMBEDDING_BACKEND != "local":
+            return
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            logger.warning("Local embeddings requested but sentence-transformers is not installed - using Gemini")
+            return
+        
+        # Picks the GPU automatically when one is available
+        self.embedder = SentenceTransformer(config.LOCAL_EMBEDDING_MODEL)
+        # Pay the first-call setup (device init, kernel selection) here instead of on the first request
+        self.embedder.encode(["warm up"])
+        logger.info(f"Local embedding model loaded: {config.LOCAL_EMBEDDING_MODEL}")
     
     def _initialize_chroma(self):
         """Initialize ChromaDB client and collections"""
@@ -39,7 +97,7 @@ class ChromaDBClient:
             
             # Create or get events collection
             self.events_collection = self.client.get_or_create_collection(
-                name=config.CHROMA_COLLECTION_EVENTS,
+                name=self._events_collection_name(),
                 metadata={"description": "City events for semantic search"}
             )
             
@@ -64,8 +122,72 @@ class ChromaDBClient:
             logger.error(f"Failed to initialize Gemini: {e}")
             raise
     
+    def _initialize_faiss(self):
+        """Mirror the events collection into a FAISS index when that backend is selected"""
+        if config.VECTOR_BACKEND != "faiss":
+            return
+        if not FAISS_AVAILABLE:
+            logger.warning("FAISS backend requested but faiss is not installed - using ChromaDB search")
+            return
+        
+        try:
+            existing = self.events_collection.get(include=["embeddings", "documents", "metadatas"])
+            
+            if config.VECTOR_QUANTIZATION == "int8":
+                if len(existing['ids']) >= INT8_MIN_TRAINING_VECTORS:
+                    # Per-dimension 8-bit codes, trained on the stored vectors; keeps the L2 metric
+                    vectors = np.asarray(existing['embeddings'], dtype=np.float32)
+                    self.faiss_index = faiss.IndexScalarQuantizer(
+                        vectors.shape[1], faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2
+                    )
+                    self.faiss_index.train(vectors)
+                else:
+                    logger.info(f"Too few events to train int8 quantization ({len(existing['ids'])}) - using float32 FAISS index")
+            
+            self._faiss_add(existing['ids'], existing['embeddings'], existing['documents'], existing['metadatas'])
+            logger.info(f"FAISS index initialized with {len(self.faiss_records)} events")
+        except Exception as e:
+            logger.error(f"Failed to initialize FAISS index, using ChromaDB search: {e}")
+            self.faiss_index = None
+            self.faiss_records = []
+    
+    def _faiss_add(self, ids, embeddings, documents, metadatas):
+        """Append stored events to the FAISS mirror (no-op unless the FAISS backend is active)"""
+        if config.VECTOR_BACKEND != "faiss" or not FAISS_AVAILABLE or not len(ids):
+            return
+        
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if self.faiss_index is None:
+            # L2 distances, the same metric the ChromaDB collection uses
+            self.faiss_index = faiss.IndexFlatL2(vectors.shape[1])
+        self.faiss_index.add(vectors)
+        self.faiss_records.extend(zip(ids, documents, metadatas))
+    
+    def _faiss_query(self, query_embedding: List[float], max_results: int) -> Dict[str, Any]:
+        """Search the FAISS mirror, returning results shaped like a ChromaDB query"""
+        distances, rows = self.faiss_index.search(
+            np.asarray([query_embedding], dtype=np.float32),
+            min(max_results, self.faiss_index.ntotal)
+        )
+        hits = [(self.faiss_records[row], float(distance)) for row, distance in zip(rows[0], distances[0]) if row != -1]
+        return {
+            "ids": [[record[0] for record, _ in hits]],
+            "documents": [[record[1] for record, _ in hits]],
+            "metadatas": [[record[2] for record, _ in hits]],
+            "distances": [[distance for _, distance in hits]]
+        }
+    
+    def _events_collection_name(self) -> str:
+        """Events collection for the active embedder; vectors of different models can't share one"""
+        if self.embedder:
+            return f"{config.CHROMA_COLLECTION_EVENTS}_{config.LOCAL_EMBEDDING_MODEL.split('/')[-1]}"
+        return config.CHROMA_COLLECTION_EVENTS
+    
     def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding using Gemini"""
+        """Generate embedding using the local model or Gemini"""
+        if self.embedder:
+            return self.embedder.encode(text).tolist()
+        
         try:
             # Use Gemini's embedding model
             model = 'models/embedding-001'
@@ -80,6 +202,61 @@ class ChromaDBClient:
             # Fallback to a zero vector if embedding fails
             return [0.0] * 768  # Gemini embedding dimension
     
+    def _get_query_embedding(self, query_text: str) -> List[float]:
+        """Embed a search query, reusing the cached embedding for repeated queries"""
+        key = hashlib.sha256(" ".join(query_text.lower().split()).encode()).hexdigest()
+        
+        cached = self.query_embedding_cache.get(key)
+        if cached and time.monotonic() - cached[1] < QUERY_EMBEDDING_CACHE_TTL:
+            self.query_embedding_cache.move_to_end(key)
+            return cached[0]
+        
+        embedding = self._generate_embedding(query_text)
+        
+        # Don't cache the zero-vector fallback from a failed embedding call
+        if any(embedding):
+            self.query_embedding_cache[key] = (embedding, time.monotonic())
+            self.query_embedding_cache.move_to_end(key)
+            if len(self.query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                self.query_embedding_cache.popitem(last=False)
+        
+        return embedding
+    
+    def _get_cached_search(self, query_vector, params: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results of a near-identical earlier search, if any"""
+        if not self.search_cache_size or self.search_cache_vectors.shape[1] != len(query_vector):
+            return None
+        
+        # One matrix-vector product over the filled rows; params are only
+        # compared for the few rows that clear the similarity threshold
+        similarities = self.search_cache_vectors[:self.search_cache_size] @ query_vector
+        candidates = np.flatnonzero(similarities >= SIMILAR_QUERY_THRESHOLD)
+        for row in candidates[np.argsort(-similarities[candidates])]:
+            cached_params, results = self.search_cache_entries[row]
+            if cached_params == params:
+                # Callers get their own copy so they can't alter the cached entry
+                return copy.deepcopy(results)
+        return None
+    
+    def _cache_search(self, query_vector, params: Tuple, results: List[Dict[str, Any]]):
+        """Remember search results for near-identical later queries"""
+        if self.search_cache_vectors is None or self.search_cache_vectors.shape[1] != len(query_vector):
+            self.search_cache_vectors = np.empty((SEARCH_RESULT_CACHE_SIZE, len(query_vector)), dtype=np.float32)
+            self._clear_search_cache()
+        
+        # Overwrite the oldest row once the buffer is full
+        row = self.search_cache_next
+        self.search_cache_vectors[row] = query_vector
+        self.search_cache_entries[row] = (params, copy.deepcopy(results))
+        self.search_cache_next = (row + 1) % SEARCH_RESULT_CACHE_SIZE
+        self.search_cache_size = min(self.search_cache_size + 1, SEARCH_RESULT_CACHE_SIZE)
+    
+    def _clear_search_cache(self):
+        """Drop all cached search results; the vector buffer is kept for reuse"""
+        self.search_cache_entries = [None] * SEARCH_RESULT_CACHE_SIZE
+        self.search_cache_size = 0
+        self.search_cache_next = 0
+    
     def _prepare_event_text(self, event: Event) -> str:
         """Prepare event text for embedding"""
         # Combine relevant text fields for better semantic search
@@ -101,6 +278,33 @@ class ChromaDBClient:
         
         return " ".join(filter(None, text_parts))
     
+    def _prepare_event_metadata(self, event: Event) -> Dict[str, Any]:
+        """Prepare event metadata for filtering and retrieval"""
+        metadata = {
+            "event_id": event.id,
+            "topic": event.topic.value,
+            "sub_topic": event.sub_topic,
+            "severity": event.impact_analysis.severity.value,
+            "latitude": event.geographic_data.location.lat,
+            "longitude": event.geographic_data.location.lng,
+            "created_at": event.temporal_data.created_at.isoformat(),
+            "source": event.source.value,
+            "confidence_score": event.impact_analysis.confidence_score,
+            "affected_users": event.impact_analysis.affected_users_estimated
+        }
+        
+        # Add location area info if available
+        if hasattr(event.geographic_data, 'administrative_area'):
+            area = event.geographic_data.administrative_area
+            if area:
+                metadata.update({
+                    "ward": area.get("ward", ""),
+                    "zone": area.get("zone", ""),
+                    "city": area.get("city", "")
+                })
+        
+        return metadata
+    
     # =========================================================================
     # EVENT VECTOR OPERATIONS
     # =========================================================================
@@ -115,28 +319,7 @@ class ChromaDBClient:
             embedding = self._generate_embedding(event_text)
             
             # Prepare metadata for filtering and retrieval
-            metadata = {
-                "event_id": event.id,
-                "topic": event.topic.value,
-                "sub_topic": event.sub_topic,
-                "severity": event.impact_analysis.severity.value,
-                "latitude": event.geographic_data.location.lat,
-                "longitude": event.geographic_data.location.lng,
-                "created_at": event.temporal_data.created_at.isoformat(),
-                "source": event.source.value,
-                "confidence_score": event.impact_analysis.confidence_score,
-                "affected_users": event.impact_analysis.affected_users_estimated
-            }
-            
-            # Add location area info if available
-            if hasattr(event.geographic_data, 'administrative_area'):
-                area = event.geographic_data.administrative_area
-                if area:
-                    metadata.update({
-                        "ward": area.get("ward", ""),
-                        "zone": area.get("zone", ""),
-                        "city": area.get("city", "")
-                    })
+            metadata = self._prepare_event_metadata(event)
             
             # Add to collection
             self.events_collection.add(
@@ -145,6 +328,9 @@ class ChromaDBClient:
                 metadatas=[metadata],
                 ids=[event.id]
             )
+            self._faiss_add([event.id], [embedding], [event_text], [metadata])
+            event.embedding = embedding  # Let callers reuse it instead of re-embedding
+            self._clear_search_cache()  # Cached results no longer reflect the collection
             
             logger.info(f"Added event {event.id} to vector database")
             return True
@@ -153,27 +339,94 @@ class ChromaDBClient:
             logger.error(f"Error adding event to vector database: {e}")
             return False
     
+    def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts with one model or Gemini call"""
+        if self.embedder:
+            return self.embedder.encode(texts, batch_size=64).tolist()
+        
+        try:
+            result = genai.embed_content(
+                model='models/embedding-001',
+                content=texts,
+                task_type="semantic_similarity"
+            )
+            return result['embedding']
+        except Exception as e:
+            logger.error(f"Error generating batch embeddings: {e}")
+            # Fall back to embedding one text at a time
+            return [self._generate_embedding(text) for text in texts]
+    
+    async def add_events(self, events: List[Event]) -> int:
+        """Add several events to the vector database in batches; returns the number added"""
+        added = 0
+        for start in range(0, len(events), EVENT_BATCH_SIZE):
+            batch = events[start:start + EVENT_BATCH_SIZE]
+            try:
+                event_texts = [self._prepare_event_text(event) for event in batch]
+                
+                embeddings = self._generate_embeddings(event_texts)
+                metadatas = [self._prepare_event_metadata(event) for event in batch]
+                event_ids = [event.id for event in batch]
+                
+                self.events_collection.add(
+                    embeddings=embeddings,
+                    documents=event_texts,
+                    metadatas=metadatas,
+                    ids=event_ids
+                )
+                self._faiss_add(event_ids, embeddings, event_texts, metadatas)
+                for event, embedding in zip(batch, embeddings):
+                    event.embedding = list(embedding)
+                self._clear_search_cache()  # Cached results no longer reflect the collection
+                
+                added += len(batch)
+                logger.info(f"Added {len(batch)} events to vector database")
+                
+            except Exception as e:
+                logger.error(f"Error adding event batch to vector database: {e}")
+        
+        return added
+    
     async def search_similar_events(self, query_text: str, 
                                   location: Optional[Coordinates] = None,
                                   topic_filter: Optional[EventTopic] = None,
-                                  max_results: int = 10) -> List[Dict[str, Any]]:
-        """Search for events similar to query text"""
+                                  max_results: int = 10,
+                                  query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+        """Search for events similar to query text (or to a precomputed query embedding)"""
         try:
-            # Generate embedding for query
-            query_embedding = self._generate_embedding(query_text)
+            # Generate embedding for query (cached per normalized query text)
+            if query_embedding is None:
+                query_embedding = self._get_query_embedding(query_text)
+            
+            # Reuse the results of a near-duplicate earlier search
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(query_vector)
+            search_params = (
+                (location.lat, location.lng) if location else None,
+                topic_filter.value if topic_filter else None,
+                max_results
+            )
+            if norm:
+                query_vector = query_vector / norm
+                cached_results = self._get_cached_search(query_vector, search_params)
+                if cached_results is not None:
+                    return cached_results
             
             # Prepare where filter
             where_filter = {}
             if topic_filter:
                 where_filter["topic"] = topic_filter.value
             
-            # Search in events collection
-            results = self.events_collection.query(
-                query_embeddings=[query_embedding],
-                n_results=max_results,
-                where=where_filter if where_filter else None,
-                include=["documents", "metadatas", "distances"]
-            )
+            # Search in events collection (the FAISS mirror serves unfiltered queries when enabled)
+            if self.faiss_index is not None and not where_filter:
+                results = self._faiss_query(query_embedding, max_results)
+            else:
+                results = self.events_collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=max_results,
+                    where=where_filter if where_filter else None,
+                    include=["documents", "metadatas", "distances"]
+                )
             
             # Process results
             similar_events = []
@@ -199,6 +452,9 @@ class ChromaDBClient:
                     else:
                         similar_events.append(event_data)
             
+            if norm:
+                self._cache_search(query_vector, search_params, similar_events)
+            
             return similar_events
             
         except Exception as e:
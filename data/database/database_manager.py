@@ -52,13 +52,11 @@ class DatabaseManager:
             # Generate mock events
             events = self.mock_gen.generate_events(events_count)
             
-            # Save events to ChromaDB
-            for i, event in enumerate(events):
-                success = await self.chroma.add_event(event)
-                if success:
-                    logger.info(f"Added event {i+1}/{len(events)}: {event.content.title}")
-                else:
-                    logger.warning(f"Failed to add event {i+1}")
+            # Save events to ChromaDB in batches
+            added = await self.chroma.add_events(events)
+            logger.info(f"Added {added}/{len(events)} events")
+            if added < len(events):
+                logger.warning(f"Failed to add {len(events) - added} events")
             
             # Generate mock users
             users = self.mock_gen.generate_users(users_count)
@@ -123,14 +121,17 @@ class DatabaseManager:
     
     async def search_events_semantically(self, query: str, 
                                        user_location: Optional[Coordinates] = None,
-                                       max_results: int = 10) -> List[Dict[str, Any]]:
-        """Search events using semantic similarity"""
+                                       max_results: int = 10,
+                                       query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+        """Search events using semantic similarity; pass query_embedding (e.g. a
+        processed event's .embedding) to skip embedding the query text"""
         try:
             # Get similar events from ChromaDB
             similar_events = await self.chroma.search_similar_events(
                 query_text=query,
                 location=user_location,
-                max_results=max_results
+                max_results=max_results,
+                query_embedding=query_embedding
             )
             
             return similar_events
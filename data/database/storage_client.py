@@ -1,6 +1,7 @@
 import firebase_admin
 from firebase_admin import credentials, storage
-from typing import List, Optional, Tuple
+import asyncio
+from typing import BinaryIO, List, Optional, Tuple, Union
 import logging
 import uuid
 import os
@@ -13,6 +14,16 @@ from config import config
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for streamed uploads; must be a multiple of 256 KiB
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+SUPPORTED_MEDIA_FORMATS = {
+    "images": (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"),
+    "videos": (".mp4", ".avi", ".mov", ".webm", ".mkv", ".flv"),
+    "max_size_mb": 50,
+    "max_files": 5
+}
+
 class FirebaseStorageClient:
     """Firebase Storage client for handling media uploads"""
     
@@ -39,9 +50,13 @@ class FirebaseStorageClient:
             # For POC, we'll work without Firebase Storage
             self.bucket = None
     
-    async def upload_media(self, file_data: bytes, file_name: str, 
+    async def upload_media(self, file_data: Union[bytes, BinaryIO], file_name: str, 
                           content_type: str, user_id: str, event_id: str) -> Optional[str]:
-        """Upload media file to Firebase Storage"""
+        """Upload media file to Firebase Storage.
+        
+        file_data may be bytes or a readable binary file object; file objects are
+        streamed in chunks so large videos never have to be held in memory.
+        """
         try:
             if not self.bucket:
                 # Return mock URL for POC
@@ -51,12 +66,9 @@ class FirebaseStorageClient:
             timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
             unique_filename = f"media/{user_id}/{event_id}/{timestamp}_{file_name}"
             
-            # Upload file
+            # The SDK calls block, so run them off the event loop
             blob = self.bucket.blob(unique_filename)
-            blob.upload_from_string(file_data, content_type=content_type)
-            
-            # Make publicly readable (for demo purposes)
-            blob.make_public()
+            await asyncio.to_thread(self._upload_blob, blob, file_data, content_type)
             
             # Return public URL
             return blob.public_url
@@ -65,6 +77,18 @@ class FirebaseStorageClient:
             logger.error(f"Error uploading media: {e}")
             return None
     
+    def _upload_blob(self, blob, file_data: Union[bytes, BinaryIO], content_type: str) -> None:
+        """Upload data to a blob and make it public (blocking)"""
+        if isinstance(file_data, (bytes, bytearray)):
+            blob.upload_from_string(file_data, content_type=content_type)
+        else:
+            # Resumable chunked upload; the SDK verifies the checksum as it streams
+            blob.chunk_size = UPLOAD_CHUNK_SIZE
+            blob.upload_from_file(file_data, content_type=content_type, rewind=True, checksum="crc32c")
+        
+        # Make publicly readable (for demo purposes)
+        blob.make_public()
+    
     async def delete_media(self, file_url: str) -> bool:
         """Delete media file from Firebase Storage"""
         try:
@@ -83,12 +107,10 @@ class FirebaseStorageClient:
             return False
     
     def get_supported_formats(self) -> dict:
-        """Get supported media formats"""
+        """Get supported media formats (a fresh copy; callers may modify it)"""
         return {
-            "images": [".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"],
-            "videos": [".mp4", ".avi", ".mov", ".webm", ".mkv", ".flv"],
-            "max_size_mb": 50,
-            "max_files": 5
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in SUPPORTED_MEDIA_FORMATS.items()
         }
 
 # Singleton instance
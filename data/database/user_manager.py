@@ -199,6 +199,22 @@ class UserManager:
             logger.error(f"Error setting work location for user {user_id}: {e}")
             return False
     
+    async def set_locations(self, user_id: str,
+                           home: Optional[Tuple[Coordinates, str]] = None,
+                           work: Optional[Tuple[Coordinates, str]] = None) -> bool:
+        """Set home and/or work locations as (location, address) in a single batched write"""
+        try:
+            fields = [name for name, value in (("home", home), ("work", work)) if value]
+            if not fields:
+                return True
+            
+            logger.info(f"Mock: Setting {' and '.join(fields)} location for user {user_id} in one write")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error setting locations for user {user_id}: {e}")
+            return False
+    
     # =========================================================================
     # USER PREFERENCES MANAGEMENT
     # =========================================================================
@@ -237,6 +253,21 @@ class UserManager:
             logger.error(f"Error tracking interaction: {e}")
             return False
     
+    async def track_user_interactions(self, user_id: str, interactions: List[Tuple[str, EventTopic]],
+                                    location: Optional[Coordinates] = None) -> bool:
+        """Track several (query, topic) interactions in a single batched write"""
+        try:
+            if not interactions:
+                return True
+            
+            topics = ", ".join(topic.value for _, topic in interactions)
+            logger.info(f"Tracked {len(interactions)} interactions for {user_id} in one write: {topics}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error tracking interactions: {e}")
+            return False
+    
     async def get_user_insights(self, user_id: str) -> Dict[str, Any]:
         """Get user insights and analytics"""
         try:
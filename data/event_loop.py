@@ -0,0 +1,22 @@
+"""
+Entrypoint helper for the async scripts: runs on uvloop when it is installed.
+Call it only from a script's __main__ block so importing a module never
+changes the event loop policy.
+"""
+
+import asyncio
+from typing import Any, Coroutine
+
+
+def run_main(main: Coroutine[Any, Any, Any]) -> Any:
+    """Run main on uvloop if available, otherwise on the default asyncio loop"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+
+    # uvloop.run only exists from 0.18; older releases need install()
+    if hasattr(uvloop, "run"):
+        return uvloop.run(main)
+    uvloop.install()
+    return asyncio.run(main)
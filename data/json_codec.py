@@ -0,0 +1,33 @@
+"""
+JSON helpers shared by the API clients, test scripts and processors.
+orjson is used when installed; otherwise the stdlib json module is used.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string"""
+    return orjson.dumps(obj).decode() if ORJSON_AVAILABLE else json.dumps(obj)
+
+
+def json_loads(data):
+    """Parse JSON from str or bytes"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def write_json_file(path: str, obj: Any) -> None:
+    """Write obj to path as indented JSON, stringifying values JSON can't represent"""
+    if ORJSON_AVAILABLE:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2, default=str)
@@ -14,6 +14,16 @@ from schemas import EventTopic, EventSeverity, Coordinates
 # ENHANCED MEDIA MODELS
 # ============================================================================
 
+# Allow-lists are built once at import; validators only do set membership
+ALLOWED_MEDIA_TYPES = frozenset({
+    'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp', 'image/bmp',
+    'video/mp4', 'video/avi', 'video/mov', 'video/webm', 'video/mkv'
+})
+ALLOWED_MEDIA_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp',
+    '.mp4', '.avi', '.mov', '.webm', '.mkv'
+})
+
 class MediaFile(BaseModel):
     """Model for uploaded media files"""
     filename: str = Field(..., min_length=1, max_length=255)
@@ -24,20 +34,14 @@ class MediaFile(BaseModel):
     
     @validator('content_type')
     def validate_content_type(cls, v):
-        allowed_types = [
-            'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp', 'image/bmp',
-            'video/mp4', 'video/avi', 'video/mov', 'video/webm', 'video/mkv'
-        ]
-        if v not in allowed_types:
-            raise ValueError(f'Content type {v} not supported. Allowed: {allowed_types}')
+        if v not in ALLOWED_MEDIA_TYPES:
+            raise ValueError(f'Content type {v} not supported. Allowed: {sorted(ALLOWED_MEDIA_TYPES)}')
         return v
     
     @validator('filename')
     def validate_filename(cls, v):
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', 
-                            '.mp4', '.avi', '.mov', '.webm', '.mkv']
-        ext = '.' + v.split('.')[-1].lower() if '.' in v else ''
-        if ext not in allowed_extensions:
+        ext = '.' + v.rpartition('.')[2].lower() if '.' in v else ''
+        if ext not in ALLOWED_MEDIA_EXTENSIONS:
             raise ValueError(f'File extension {ext} not supported')
         return v
 
@@ -1,5 +1,7 @@
 import google.generativeai as genai
-from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+from collections import OrderedDict
+from typing import BinaryIO, List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 import logging
 import json
@@ -19,10 +21,19 @@ from data.database.storage_client import storage_client
 
 logger = logging.getLogger(__name__)
 
+# Upload fan-out limits: at most this many uploads in flight per incident, each
+# retried with 1s, 2s, ... backoff before giving up
+MEDIA_UPLOAD_CONCURRENCY = 8
+MEDIA_UPLOAD_ATTEMPTS = 3
+
+# Analyses are keyed by (media_url, media_type); least recently used entries are evicted
+MEDIA_ANALYSIS_CACHE_SIZE = 1024
+
 class EnhancedEventProcessor:
     """Enhanced event processor with comprehensive media support"""
     
     def __init__(self):
+        self.media_analysis_cache = OrderedDict()  # (media_url, media_type) -> MediaAnalysis
         self._initialize_gemini()
     
     def _initialize_gemini(self):
@@ -40,7 +51,23 @@ class EnhancedEventProcessor:
     # =========================================================================
     
     async def analyze_media_comprehensive(self, media_url: str, media_type: str = "image") -> Optional[MediaAnalysis]:
-        """Comprehensive media analysis with context-aware processing"""
+        """Comprehensive media analysis with context-aware processing, cached per (url, media type)"""
+        key = (media_url, media_type)
+        cached = self.media_analysis_cache.get(key)
+        if cached is not None:
+            self.media_analysis_cache.move_to_end(key)
+            return cached
+        
+        analysis = await self._analyze_media(media_url, media_type)
+        if analysis:
+            # Failed analyses are not cached so they are retried on the next call
+            self.media_analysis_cache[key] = analysis
+            if len(self.media_analysis_cache) > MEDIA_ANALYSIS_CACHE_SIZE:
+                self.media_analysis_cache.popitem(last=False)
+        return analysis
+    
+    async def _analyze_media(self, media_url: str, media_type: str) -> Optional[MediaAnalysis]:
+        """Run the media analysis for a single URL"""
         try:
             # Enhanced analysis that varies based on media type and content hints
             if media_type == "video":
@@ -128,7 +155,8 @@ class EnhancedEventProcessor:
     async def process_multiple_media(self, media_files: List[Dict[str, Any]], user_id: str, event_id: str) -> List[str]:
         """Process multiple media files for an incident"""
         try:
-            uploaded_urls = []
+            upload_slots = asyncio.Semaphore(MEDIA_UPLOAD_CONCURRENCY)
+            uploads = []
             
             for media_file in media_files:
                 file_data = media_file.get('data')  # bytes
@@ -144,23 +172,38 @@ class EnhancedEventProcessor:
                     logger.warning(f"Unsupported media type: {content_type}")
                     continue
                 
-                # Upload to storage
-                uploaded_url = await storage_client.upload_media(
-                    file_data, file_name, content_type, user_id, event_id
-                )
-                
-                if uploaded_url:
-                    uploaded_urls.append(uploaded_url)
-                    logger.info(f"Successfully uploaded media: {file_name}")
-                else:
-                    logger.error(f"Failed to upload media: {file_name}")
+                uploads.append(self._upload_with_retry(
+                    upload_slots, file_data, file_name, content_type, user_id, event_id
+                ))
             
-            return uploaded_urls
+            # Upload concurrently, bounded by the semaphore; gather keeps input order
+            uploaded_urls = await asyncio.gather(*uploads)
+            return [url for url in uploaded_urls if url]
             
         except Exception as e:
             logger.error(f"Error processing multiple media files: {e}")
             return []
     
+    async def _upload_with_retry(self, upload_slots: asyncio.Semaphore, file_data: Union[bytes, BinaryIO], file_name: str,
+                                 content_type: str, user_id: str, event_id: str) -> Optional[str]:
+        """Upload one media file under the shared concurrency limit, retrying with exponential backoff"""
+        for attempt in range(MEDIA_UPLOAD_ATTEMPTS):
+            # Hold a slot only while uploading, not during the backoff
+            async with upload_slots:
+                uploaded_url = await storage_client.upload_media(
+                    file_data, file_name, content_type, user_id, event_id
+                )
+            
+            if uploaded_url:
+                logger.info(f"Successfully uploaded media: {file_name}")
+                return uploaded_url
+            
+            if attempt < MEDIA_UPLOAD_ATTEMPTS - 1:
+                await asyncio.sleep(2 ** attempt)
+        
+        logger.error(f"Failed to upload media: {file_name}")
+        return None
+    
     def _is_supported_media(self, filename: str, content_type: str) -> bool:
         """Check if media type is supported"""
         supported_formats = storage_client.get_supported_formats()
@@ -268,7 +311,8 @@ class EnhancedEventProcessor:
             }}
             """
             
-            response = self.model.generate_content(classification_prompt)
+            # Native async call so concurrent classifications don't block the event loop
+            response = await self.model.generate_content_async(classification_prompt)
             
             try:
                 result = json.loads(response.text.strip())
@@ -10,6 +10,7 @@ import os
 # Add parent directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import config
+from data.json_codec import json_loads
 from data.models.schemas import (
     Event, EventContent, EventTopic, EventSeverity, EventSource,
     GeographicData, LocationData, Coordinates, ImpactAnalysis,
@@ -105,7 +106,7 @@ class EventProcessor:
             
             try:
                 # Parse JSON response
-                result = json.loads(response.text.strip())
+                result = json_loads(response.text.strip())
                 
                 topic = EventTopic(result["topic"])
                 sub_topic = result["sub_topic"]
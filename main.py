@@ -4,14 +4,16 @@ City Pulse Agent - FastAPI Backend
 Complete REST API for smart city incident reporting and management
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends, BackgroundTasks, status
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends, BackgroundTasks, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, ValidationError
 from typing import List, Dict, Any, Optional, Union
 import logging
 import asyncio
+import hashlib
 from datetime import datetime, timedelta
 import json
 import io
@@ -60,6 +62,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies for clients that send Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Add API routers
 app.include_router(subcategory_router)
 
@@ -70,6 +75,21 @@ app.include_router(user_router)
 # Security
 security = HTTPBearer(auto_error=False)
 
+def project_fields(payload: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    """Keep only the comma-separated top-level fields requested by the client"""
+    if not fields:
+        return payload
+    wanted = {field.strip() for field in fields.split(",")}
+    return {key: value for key, value in payload.items() if key in wanted}
+
+def etag_response(request: Request, payload: Dict[str, Any]) -> Response:
+    """Return payload with a content ETag, or 304 when the client already has it"""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    etag = f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 # ============================================================================
 # STARTUP AND HEALTH CHECK
 # ============================================================================
@@ -262,7 +282,8 @@ async def search_events(
     radius_km: float = 5,
     topic: Optional[EventTopic] = None,
     severity: Optional[EventSeverity] = None,
-    max_results: int = 10
+    max_results: int = 10,
+    fields: Optional[str] = None
 ):
     """Search events using semantic similarity"""
     try:
@@ -299,12 +320,12 @@ async def search_events(
                 "created_at": metadata.get("created_at")
             })
         
-        return {
+        return project_fields({
             "success": True,
             "query": query,
             "total_results": len(filtered_results),
             "results": filtered_results[:max_results]
-        }
+        }, fields)
     except Exception as e:
         logger.error(f"Error searching events: {e}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
@@ -315,7 +336,8 @@ async def get_nearby_events(
     lng: float,
     radius_km: float = 5,
     topic: Optional[EventTopic] = None,
-    max_results: int = 20
+    max_results: int = 20,
+    fields: Optional[str] = None
 ):
     """Get events near a specific location"""
     try:
@@ -351,13 +373,13 @@ async def get_nearby_events(
                     }
                 })
         
-        return {
+        return project_fields({
             "success": True,
             "center_location": {"lat": lat, "lng": lng},
             "radius_km": radius_km,
             "total_events": len(nearby_events),
             "events": nearby_events
-        }
+        }, fields)
     except Exception as e:
         logger.error(f"Error getting nearby events: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get nearby events: {str(e)}")
@@ -470,16 +492,16 @@ async def analyze_media(
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 @app.get("/media/formats", tags=["Media"])
-async def get_supported_formats():
+async def get_supported_formats(request: Request):
     """Get supported media formats and limits"""
     try:
         formats = storage_client.get_supported_formats()
-        return {
+        return etag_response(request, {
             "success": True,
             "formats": formats,
             "upload_endpoint": "/media/upload",
             "analysis_endpoint": "/media/analyze"
-        }
+        })
     except Exception as e:
         logger.error(f"Error getting formats: {e}")
         raise HTTPException(status_code=500, detail="Failed to get formats")
@@ -632,7 +654,8 @@ async def get_analytics_overview(
 async def get_incident_heatmap(
     topic: Optional[EventTopic] = None,
     severity: Optional[EventSeverity] = None,
-    timeframe: str = "24h"
+    timeframe: str = "24h",
+    fields: Optional[str] = None
 ):
     """Get incident heatmap data for visualization"""
     try:
@@ -645,7 +668,7 @@ async def get_incident_heatmap(
             {"lat": 12.8456, "lng": 77.6603, "intensity": 0.4, "count": 5},   # Electronic City
         ]
         
-        return {
+        return project_fields({
             "success": True,
             "heatmap_data": heatmap_points,
             "filters": {
@@ -654,7 +677,7 @@ async def get_incident_heatmap(
                 "timeframe": timeframe
             },
             "total_points": len(heatmap_points)
-        }
+        }, fields)
         
     except Exception as e:
         logger.error(f"Error getting heatmap: {e}")
@@ -726,7 +749,7 @@ async def populate_demo_data(
         raise HTTPException(status_code=500, detail=f"Demo data population failed: {str(e)}")
 
 @app.get("/demo/test-scenarios", tags=["Demo"])
-async def get_test_scenarios():
+async def get_test_scenarios(request: Request):
     """Get predefined test scenarios for demo"""
     scenarios = [
         {
@@ -758,11 +781,11 @@ async def get_test_scenarios():
         }
     ]
     
-    return {
+    return etag_response(request, {
         "success": True,
         "scenarios": scenarios,
         "usage": "Use these scenarios to test different API endpoints"
-    }
+    })
 
 # ============================================================================
 # ERROR HANDLERS
@@ -5,27 +5,35 @@ Quick demonstration of Google ADK agent capabilities
 Shows the difference between original and ADK implementations
 """
 
-import requests
+import asyncio
+import aiohttp
 import json
 import time
 from datetime import datetime
 
 BASE_URL = "http://localhost:8000"
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-def make_request(method, endpoint, data=None):
-    """Make HTTP request with timing"""
+async def make_request(session, method, endpoint, data=None, data_bytes=None):
+    """Make HTTP request with timing; data_bytes sends a pre-serialized JSON body"""
     start_time = time.time()
     try:
         if method == "GET":
-            response = requests.get(f"{BASE_URL}{endpoint}", timeout=10)
+            request = session.get(f"{BASE_URL}{endpoint}")
+        elif data_bytes is not None:
+            request = session.post(f"{BASE_URL}{endpoint}", data=data_bytes, headers=JSON_HEADERS)
         else:
-            response = requests.post(f"{BASE_URL}{endpoint}", json=data, timeout=10)
+            request = session.post(f"{BASE_URL}{endpoint}", json=data)
+        
+        async with request as response:
+            success = response.status == 200
+            body = await response.json() if success else await response.text()
         
         response_time = (time.time() - start_time) * 1000
         return {
-            "success": response.status_code == 200,
-            "data": response.json() if response.status_code == 200 else None,
-            "error": response.text if response.status_code != 200 else None,
+            "success": success,
+            "data": body if success else None,
+            "error": body if not success else None,
             "response_time_ms": response_time
         }
     except Exception as e:
@@ -55,14 +63,23 @@ def print_response(title, result):
     else:
         print(f"❌ Failed: {result['error']}")
 
-def main():
+async def main():
     """Run ADK demonstration"""
     print("🤖 Google ADK Agent Quick Demo")
     print("=" * 50)
     
+    # One keep-alive session shared by all demo calls
+    connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await run_demos(session)
+
+async def run_demos(session):
+    """Run the individual demos over a shared session"""
+    
     # Check server health
     print("Checking server status...")
-    health = make_request("GET", "/health")
+    health = await make_request(session, "GET", "/health")
     if not health["success"]:
         print("❌ Server not running. Please start with: python3 main.py")
         return
@@ -71,7 +88,7 @@ def main():
     
     # Check ADK status
     print("\nChecking ADK status...")
-    adk_status = make_request("GET", "/adk/test/status")
+    adk_status = await make_request(session, "GET", "/adk/test/status")
     print_response("ADK Status Check", adk_status)
     
     if not adk_status["success"] or not adk_status["data"].get("adk_installed", False):
@@ -89,7 +106,7 @@ def main():
         "location": {"lat": 12.9352, "lng": 77.6245}
     }
     
-    adk_chat = make_request("POST", "/adk/chat", chat_data)
+    adk_chat = await make_request(session, "POST", "/adk/chat", chat_data)
     print_response("ADK Chat Response", adk_chat)
     
     # Demo 2: Context Awareness
@@ -102,7 +119,7 @@ def main():
             "message": "What about alternative routes to the same area?"
         }
         
-        context_test = make_request("POST", "/adk/chat", follow_up)
+        context_test = await make_request(session, "POST", "/adk/chat", follow_up)
         print_response("Context-Aware Follow-up", context_test)
     
     # Demo 3: Dashboard Generation
@@ -116,7 +133,7 @@ def main():
         "max_cards": 4
     }
     
-    adk_dashboard = make_request("POST", "/adk/dashboard", dashboard_data)
+    adk_dashboard = await make_request(session, "POST", "/adk/dashboard", dashboard_data)
     print_response("ADK Dashboard Generation", adk_dashboard)
     
     # Demo 4: Filtered Dashboard
@@ -129,7 +146,7 @@ def main():
         "max_cards": 2
     }
     
-    filtered_result = make_request("POST", "/adk/dashboard", filtered_dashboard)
+    filtered_result = await make_request(session, "POST", "/adk/dashboard", filtered_dashboard)
     print_response("Filtered Dashboard", filtered_result)
     
     # Demo 5: Insights with Predictions
@@ -144,7 +161,7 @@ def main():
         "include_predictions": True
     }
     
-    adk_insights = make_request("POST", "/adk/insights", insights_data)
+    adk_insights = await make_request(session, "POST", "/adk/insights", insights_data)
     print_response("ADK Insights with Predictions", adk_insights)
     
     # Demo 6: Comparison with Original
@@ -158,12 +175,13 @@ def main():
         "location": {"lat": 12.9116, "lng": 77.6370}
     }
     
-    # Test original agent
-    original_result = make_request("POST", "/agent/chat", test_message)
+    # Test original and ADK agents side by side, serializing the shared payload once
+    payload = json.dumps(test_message).encode()
+    original_result, adk_comparison = await asyncio.gather(
+        make_request(session, "POST", "/agent/chat", data_bytes=payload),
+        make_request(session, "POST", "/adk/chat", data_bytes=payload)
+    )
     print_response("Original Agent", original_result)
-    
-    # Test ADK agent
-    adk_comparison = make_request("POST", "/adk/chat", test_message)
     print_response("ADK Agent", adk_comparison)
     
     # Performance comparison
@@ -186,10 +204,11 @@ def main():
     print("DEMO 5: Agent Analytics")
     print("="*60)
     
-    adk_analytics = make_request("GET", "/adk/analytics/usage")
+    adk_analytics, agents_info = await asyncio.gather(
+        make_request(session, "GET", "/adk/analytics/usage"),
+        make_request(session, "GET", "/adk/analytics/agents")
+    )
     print_response("ADK Usage Analytics", adk_analytics)
-    
-    agents_info = make_request("GET", "/adk/analytics/agents")
     print_response("ADK Agents Information", agents_info)
     
     # Summary
@@ -208,4 +227,4 @@ def main():
     print("🧪 Run full test suite: python3 test_google_adk_agent.py")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
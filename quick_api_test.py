@@ -2,7 +2,8 @@
 """
 Quick test with corrected event creation
 """
-import requests
+import asyncio
+import aiohttp
 import json
 
 # Test the corrected event creation
@@ -16,11 +17,6 @@ data = {
     "severity": "medium"
 }
 
-print("🧪 Testing corrected event creation...")
-response = requests.post(url, json=data)
-print(f"Status: {response.status_code}")
-print(f"Response: {response.json()}")
-
 # Test enhanced event creation
 url_enhanced = "http://localhost:8000/events/enhanced"
 enhanced_data = {
@@ -34,7 +30,26 @@ enhanced_data = {
     "media_urls": []
 }
 
-print("\n🎬 Testing enhanced event creation...")
-response = requests.post(url_enhanced, json=enhanced_data)
-print(f"Status: {response.status_code}")
-print(f"Response: {response.json()}")
+async def post_event(session, url, payload):
+    """POST an event and return (status, decoded body)"""
+    async with session.post(url, json=payload) as response:
+        return response.status, await response.json()
+
+async def main():
+    # Both requests are independent, so send them together on one session
+    async with aiohttp.ClientSession() as session:
+        (status, result), (enhanced_status, enhanced_result) = await asyncio.gather(
+            post_event(session, url, data),
+            post_event(session, url_enhanced, enhanced_data)
+        )
+
+    print("🧪 Testing corrected event creation...")
+    print(f"Status: {status}")
+    print(f"Response: {result}")
+
+    print("\n🎬 Testing enhanced event creation...")
+    print(f"Status: {enhanced_status}")
+    print(f"Response: {enhanced_result}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
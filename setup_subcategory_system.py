@@ -7,13 +7,44 @@ Installs dependencies, configures Firestore, and initializes the system
 import subprocess
 import sys
 import os
+import asyncio
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import version, PackageNotFoundError
 from pathlib import Path
 
+try:
+    from packaging.requirements import Requirement
+    PACKAGING_AVAILABLE = True
+except ImportError:
+    PACKAGING_AVAILABLE = False
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Splits a requirement line at its version specifier / extras / marker
+REQUIREMENT_NAME_PATTERN = re.compile(r'[<>=!~\[;\s]')
+
+# Matches a KEY=value assignment line in a .env file
+ENV_ASSIGNMENT_PATTERN = re.compile(r'\s*([A-Za-z_][A-Za-z0-9_]*)\s*=(.*)')
+
+
+def is_requirement_satisfied(requirement_spec):
+    """Check whether an installed distribution already satisfies a requirement"""
+    if not PACKAGING_AVAILABLE:
+        return False
+    
+    requirement = Requirement(requirement_spec)
+    try:
+        installed_version = version(requirement.name)
+    except PackageNotFoundError:
+        return False
+    
+    return requirement.specifier.contains(installed_version, prereleases=True)
+
 
 def install_dependencies():
     """Install required Python packages"""
@@ -26,14 +57,22 @@ def install_dependencies():
         "firebase-admin>=6.1.0"
     ]
     
-    for package in required_packages:
-        try:
-            logger.info(f"Installing {package}...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-            logger.info(f"✅ {package} installed successfully")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"❌ Failed to install {package}: {e}")
-            return False
+    missing_packages = [package for package in required_packages if not is_requirement_satisfied(package)]
+    if not missing_packages:
+        logger.info("✅ All dependencies already installed")
+        return True
+    
+    try:
+        logger.info(f"Installing {', '.join(missing_packages)}...")
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "install",
+            "--disable-pip-version-check", "--no-input",
+            *missing_packages
+        ])
+        logger.info("✅ Dependencies installed successfully")
+    except subprocess.CalledProcessError as e:
+        logger.error(f"❌ Failed to install dependencies: {e}")
+        return False
     
     return True
 
@@ -58,12 +97,20 @@ def update_requirements_txt():
             with open(requirements_file, 'r') as f:
                 existing_requirements = f.read().splitlines()
         
+        # Canonical names of packages already listed
+        existing_names = {
+            REQUIREMENT_NAME_PATTERN.split(line.strip(), 1)[0].lower()
+            for line in existing_requirements
+            if line.strip() and not line.lstrip().startswith('#')
+        }
+        
         # Add new requirements if not already present
         updated_requirements = existing_requirements.copy()
         for req in new_requirements:
-            package_name = req.split('>=')[0].split('==')[0]
-            if not any(package_name in line for line in existing_requirements):
+            package_name = REQUIREMENT_NAME_PATTERN.split(req, 1)[0].lower()
+            if package_name not in existing_names:
                 updated_requirements.append(req)
+                existing_names.add(package_name)
                 logger.info(f"✅ Added {req} to requirements.txt")
         
         # Write updated requirements
@@ -79,6 +126,18 @@ def update_requirements_txt():
         return False
 
 
+def parse_env_file(env_file):
+    """Parse a .env file into a dict of stripped values in one pass"""
+    env_values = {}
+    with open(env_file, 'r') as f:
+        for line in f:
+            match = ENV_ASSIGNMENT_PATTERN.match(line)
+            if match:
+                env_values[match.group(1)] = match.group(2).strip()
+    
+    return env_values
+
+
 def check_env_configuration():
     """Check and guide Firestore environment configuration"""
     logger.info("⚙️ Checking environment configuration...")
@@ -89,21 +148,14 @@ def check_env_configuration():
         "GEMINI_API_KEY"
     ]
     
-    missing_vars = []
-    
     # Check .env file
     env_file = Path(".env")
     if not env_file.exists():
         logger.warning("⚠️ .env file not found")
         return False
     
-    # Read .env file
-    with open(env_file, 'r') as f:
-        env_content = f.read()
-    
-    for var in required_env_vars:
-        if f"{var}=" not in env_content or f"{var}=" in env_content and not env_content.split(f"{var}=")[1].split('\n')[0].strip():
-            missing_vars.append(var)
+    env_values = parse_env_file(env_file)
+    missing_vars = [var for var in required_env_vars if not env_values.get(var)]
     
     if missing_vars:
         logger.warning(f"⚠️ Missing environment variables: {', '.join(missing_vars)}")
@@ -133,20 +185,19 @@ def check_env_configuration():
     return True
 
 
-def test_firestore_connection():
-    """Test Firestore connection"""
+def test_firestore_connection(loop):
+    """Test Firestore connection on the shared setup event loop"""
     logger.info("🔌 Testing Firestore connection...")
     
     try:
         # Import and test the Firestore client
         from data.database.firestore_client import firestore_subcategory_client
-        import asyncio
         
         async def test_connection():
             success = await firestore_subcategory_client.initialize()
             return success
         
-        success = asyncio.run(test_connection())
+        success = loop.run_until_complete(test_connection())
         
         if success:
             logger.info("✅ Firestore connection successful")
@@ -160,13 +211,12 @@ def test_firestore_connection():
         return False
 
 
-def initialize_subcategory_system():
+def initialize_subcategory_system(loop):
     """Initialize the subcategory system with predefined data"""
     logger.info("🚀 Initializing subcategory system...")
     
     try:
         from data.processors.enhanced_subcategory_processor import enhanced_subcategory_processor
-        import asyncio
         
         async def initialize_system():
             # Initialize the enhanced processor
@@ -194,7 +244,7 @@ def initialize_subcategory_system():
             
             return True
         
-        success = asyncio.run(initialize_system())
+        success = loop.run_until_complete(initialize_system())
         
         if success:
             logger.info("✅ Subcategory system initialized successfully")
@@ -208,28 +258,41 @@ def initialize_subcategory_system():
         return False
 
 
-def run_system_test():
-    """Run a quick system test"""
+def run_system_test(timeout=120):
+    """Run a quick system test, streaming its output as it arrives"""
     logger.info("🧪 Running system test...")
     
     try:
-        import subprocess
-        result = subprocess.run([
-            sys.executable, "test_subcategory_system.py"
-        ], capture_output=True, text=True, timeout=120)
+        process = subprocess.Popen(
+            [sys.executable, "test_subcategory_system.py"],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+        )
+        
+        def stream_output():
+            for line in process.stdout:
+                logger.info(line.rstrip())
         
-        if result.returncode == 0:
+        # Stream on a thread so the timeout holds even if the test stops printing
+        reader = threading.Thread(target=stream_output, daemon=True)
+        reader.start()
+        
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            reader.join()
+            logger.warning("⚠️ System test timed out (may still be working)")
+            return True
+        
+        reader.join()
+        if returncode == 0:
             logger.info("✅ System test passed")
             return True
         else:
-            logger.warning(f"⚠️ System test failed with return code {result.returncode}")
-            logger.info("Output:", result.stdout)
-            logger.error("Errors:", result.stderr)
+            logger.warning(f"⚠️ System test failed with return code {returncode}")
             return False
             
-    except subprocess.TimeoutExpired:
-        logger.warning("⚠️ System test timed out (may still be working)")
-        return True
     except Exception as e:
         logger.error(f"❌ System test failed: {e}")
         return False
@@ -240,22 +303,40 @@ def main():
     print("🚀 Enhanced Subcategory Management System Setup")
     print("=" * 60)
     
-    # Step 1: Install dependencies
-    if not install_dependencies():
-        print("❌ Failed to install dependencies")
-        return 1
-    
-    # Step 2: Update requirements.txt
-    if not update_requirements_txt():
-        print("⚠️ Failed to update requirements.txt (continuing anyway)")
-    
-    # Step 3: Check environment configuration
-    if not check_env_configuration():
-        print("❌ Environment configuration incomplete")
-        return 1
+    # One event loop for every async step, so the Firestore client's
+    # channel opened by the connection test is reused by initialization
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return run_setup(loop)
+    finally:
+        loop.close()
+
+
+def run_setup(loop):
+    """Run the setup steps on the given event loop"""
+    # The .env check only reads local files, so it overlaps the pip install;
+    # the remaining steps keep their fail-fast order
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        install_future = executor.submit(install_dependencies)
+        env_future = executor.submit(check_env_configuration)
+        
+        # Step 1: Install dependencies
+        if not install_future.result():
+            print("❌ Failed to install dependencies")
+            return 1
+        
+        # Step 2: Update requirements.txt
+        if not update_requirements_txt():
+            print("⚠️ Failed to update requirements.txt (continuing anyway)")
+        
+        # Step 3: Check environment configuration
+        if not env_future.result():
+            print("❌ Environment configuration incomplete")
+            return 1
     
     # Step 4: Test Firestore connection
-    if not test_firestore_connection():
+    if not test_firestore_connection(loop):
         print("❌ Firestore connection failed")
         print("\n💡 Tips:")
         print("   - Ensure FIREBASE_PROJECT_ID is correct")
@@ -264,7 +345,7 @@ def main():
         return 1
     
     # Step 5: Initialize subcategory system
-    if not initialize_subcategory_system():
+    if not initialize_subcategory_system(loop):
         print("❌ System initialization failed")
         return 1
     
@@ -8,32 +8,48 @@ import subprocess
 import sys
 import os
 import time
+import threading
 import requests
 import asyncio
+import importlib.util
 from datetime import datetime
 
 def install_missing_dependencies():
     """Install any missing FastAPI dependencies"""
-    required_packages = [
-        'fastapi==0.104.1',
-        'uvicorn==0.24.0',
-        'python-multipart==0.0.6',
-        'aiohttp==3.9.0'  # For API testing
-    ]
+    # Map of pip requirement -> importable module name
+    required_packages = {
+        'fastapi==0.104.1': 'fastapi',
+        'uvicorn==0.24.0': 'uvicorn',
+        'python-multipart==0.0.6': 'multipart',
+        'aiohttp==3.9.0': 'aiohttp'  # For API testing
+    }
     
     print("📦 Checking FastAPI dependencies...")
-    for package in required_packages:
-        try:
-            package_name = package.split('==')[0]
-            __import__(package_name.replace('-', '_'))
-            print(f"✅ {package_name}")
-        except ImportError:
-            print(f"📥 Installing {package}...")
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-                print(f"✅ {package} installed")
-            except subprocess.CalledProcessError as e:
-                print(f"❌ Failed to install {package}: {e}")
+    missing_packages = []
+    for package, module_name in required_packages.items():
+        if importlib.util.find_spec(module_name) is None:
+            missing_packages.append(package)
+        else:
+            print(f"✅ {package.split('==')[0]}")
+    
+    if not missing_packages:
+        return
+    
+    print(f"📥 Installing {', '.join(missing_packages)}...")
+    try:
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "install",
+            "--disable-pip-version-check", "--no-input",
+            *missing_packages
+        ])
+        print("✅ Missing dependencies installed")
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to install dependencies: {e}")
+
+DATA_LAYER_MODULES = [
+    "data.database.database_manager",
+    "data.processors.enhanced_event_processor"
+]
 
 def check_data_layer():
     """Quick check if data layer is working"""
@@ -42,9 +58,10 @@ def check_data_layer():
         # Add current directory to path
         sys.path.append(os.getcwd())
         
-        # Test imports
-        from data.database.database_manager import db_manager
-        from data.processors.enhanced_event_processor import enhanced_processor
+        # Resolve modules without executing them; uvicorn does the real import
+        for module_name in DATA_LAYER_MODULES:
+            if importlib.util.find_spec(module_name) is None:
+                raise ImportError(f"No module named '{module_name}'")
         print("✅ Data layer imports successful")
         
         return True
@@ -55,42 +72,75 @@ def check_data_layer():
 def wait_for_server(url="http://localhost:8000", timeout=30):
     """Wait for server to start"""
     print(f"\n⏳ Waiting for server at {url}...")
-    start_time = time.time()
+    deadline = time.time() + timeout
+    session = requests.Session()
+    delay = 0.1
     
-    while time.time() - start_time < timeout:
+    # Probe immediately, then back off exponentially up to 1s between polls
+    while time.time() < deadline:
         try:
-            response = requests.get(f"{url}/health", timeout=5)
+            response = session.get(f"{url}/health", timeout=2)
             if response.status_code == 200:
                 print("✅ Server is ready!")
                 return True
         except requests.exceptions.RequestException:
             pass
         
-        time.sleep(2)
+        time.sleep(delay)
+        delay = min(delay * 1.5, 1.0)
     
     print("❌ Server startup timeout")
     return False
 
-async def populate_demo_data():
+DEMO_SEED_REQUESTS = [
+    ("/demo/populate", {"events_count": 25, "users_count": 5})
+]
+
+async def populate_demo_data(url="http://localhost:8000"):
     """Populate with demo data after server starts"""
     try:
         print("\n🎭 Populating demo data...")
         
         # Use aiohttp for async request
         import aiohttp
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "http://localhost:8000/demo/populate",
-                json={"events_count": 25, "users_count": 5}
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    print(f"✅ Demo data populated: {result.get('events_count')} events")
-                else:
-                    print(f"⚠️ Demo data population failed: {response.status}")
+        
+        async def seed(session, endpoint, payload):
+            async with session.post(f"{url}{endpoint}", json=payload) as response:
+                result = await response.json() if response.status == 200 else None
+                return endpoint, response.status, result
+        
+        connector = aiohttp.TCPConnector(limit=4, keepalive_timeout=30)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            # Warm the keep-alive connection before the seed requests go out
+            async with session.get(f"{url}/health") as response:
+                await response.read()
+            
+            results = await asyncio.gather(
+                *(seed(session, endpoint, payload) for endpoint, payload in DEMO_SEED_REQUESTS),
+                return_exceptions=True
+            )
+        
+        for outcome in results:
+            if isinstance(outcome, Exception):
+                print(f"⚠️ Could not populate demo data: {outcome}")
+                continue
+            endpoint, status, result = outcome
+            if status == 200:
+                print(f"✅ Demo data populated: {result.get('events_count')} events")
+            else:
+                print(f"⚠️ Demo data population failed ({endpoint}): {status}")
     except Exception as e:
         print(f"⚠️ Could not populate demo data: {e}")
 
+SERVER_READY_MARKER = "Application startup complete"
+
+def tee_server_output(server, ready):
+    """Echo server output to the terminal and flag readiness on the startup log line"""
+    for line in server.stdout:
+        sys.stdout.write(line)
+        if not ready.is_set() and SERVER_READY_MARKER in line:
+            ready.set()
+
 def main():
     """Main startup function"""
     print("🏙️ City Pulse Agent - Server Startup")
@@ -117,18 +167,32 @@ def main():
     print("\n🛑 Press Ctrl+C to stop the server")
     print("-" * 45)
     
+    server = None
     try:
-        # Start the server
-        subprocess.run([
+        # Start the server, tailing its log to detect readiness
+        server = subprocess.Popen([
             sys.executable, "-m", "uvicorn", 
             "main:app",
             "--host", "0.0.0.0",
             "--port", "8000", 
             "--reload",
             "--log-level", "info"
-        ], check=True)
+        ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        
+        ready = threading.Event()
+        threading.Thread(target=tee_server_output, args=(server, ready), daemon=True).start()
+        
+        if ready.wait(timeout=30) or wait_for_server(timeout=5):
+            asyncio.run(populate_demo_data())
+        
+        returncode = server.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, server.args)
         
     except KeyboardInterrupt:
+        if server is not None:
+            server.terminate()
+            server.wait()
         print("\n\n🛑 Server stopped by user")
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Server failed to start: {e}")
@@ -1,156 +1,368 @@
-            user["location"]
+#!/usr/bin/env python3
+"""
+Test script for City Pulse Agentic Layer
+Runs realistic user journeys against the /agent endpoints
+"""
+
+import asyncio
+import contextvars
+import httpx
+import importlib.util
+import logging
+import sys
+import time
+from typing import Dict, Any, List, Optional
+
+from data.json_codec import json_dumps, json_loads, write_json_file
+from data.event_loop import run_main
+
+# Phases run concurrently, so each phase collects its own output and prints
+# it as one block when it finishes; output outside a phase prints directly
+_phase_output = contextvars.ContextVar("phase_output", default=None)
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter("%(message)s"))
+
+class PhaseOutputHandler(logging.Handler):
+    """Route records to the running phase's buffer, or straight to the console"""
+    
+    def emit(self, record):
+        buffer = _phase_output.get()
+        if buffer is None:
+            _console_handler.handle(record)
+        else:
+            buffer.append(record)
+
+logger = logging.getLogger("agentic_suite")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+logger.addHandler(PhaseOutputHandler())
+
+# HTTP/2 needs the optional h2 package; without it httpx speaks HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Base URL for the API
+BASE_URL = "http://localhost:8000"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Per-phase results are streamed here as JSON lines while the suite runs
+RESULTS_STREAM_FILE = "agentic_test_results.jsonl"
+
+# Existing demo users (see /users/demo/create-sample-users)
+TEST_USERS = [
+    {
+        "id": "arjun",
+        "name": "Arjun Kumar",
+        "location": {"lat": 12.9716, "lng": 77.5946}  # MG Road
+    },
+    {
+        "id": "priya",
+        "name": "Priya Sharma",
+        "location": {"lat": 12.9352, "lng": 77.6245}  # Koramangala
+    }
+]
+
+HSR_LAYOUT_LOCATION = {"lat": 12.9116, "lng": 77.6370}
+
+# User journeys driven by AgenticLayerTester._run_journey; each conversation
+# entry is (step name, message)
+JOURNEYS = [
+    {
+        "name": "morning_commute",
+        "banner": "🌅 USER JOURNEY 1: MORNING COMMUTE",
+        "user": TEST_USERS[0],  # Arjun Kumar
+        "role": "Software Engineer",
+        "scenario": "8:30 AM, commuting from MG Road to Electronic City via ORR",
+        "period": "morning",
+        "insight_type": "traffic",
+        "insight_icon": "📈",
+        "insight_step": "traffic_insights",
+        "conversation_summary": "Traffic, alternative routes, weather impact and follow-up",
+        # Steps 2-4 come before the insights step, the follow-up (step 6) after it
+        "conversation": [
+            ("traffic_check", "How's the traffic on ORR towards Electronic City right now?"),
+            ("route_alternatives", "Are there any alternative routes I should take to avoid delays?"),
+            ("weather_check", "Will the weather affect my commute today?")
+        ],
+        "follow_up_conversation": [
+            ("follow_up", "Thanks! Can you notify me if there are any incidents on ORR?")
+        ]
+    },
+    {
+        "name": "evening_discovery",
+        "banner": "🌆 USER JOURNEY 2: EVENING EVENT DISCOVERY",
+        "user": TEST_USERS[1],  # Priya Sharma
+        "role": "Marketing Manager",
+        "scenario": "6:00 PM, looking for evening activities in Koramangala area",
+        "period": "evening",
+        "insight_type": "events",
+        "insight_icon": "🎪",
+        "insight_step": "event_insights",
+        "conversation_summary": "Local events, dining options, evening weather and transportation",
+        "conversation": [
+            ("event_discovery", "What's happening in Koramangala tonight? Any interesting events or activities?"),
+            ("dining_options", "Any good restaurants open for dinner? Preferably places not affected by traffic or construction."),
+            ("weather_check", "Should I carry an umbrella? How's the weather looking for tonight?")
+        ],
+        "follow_up_conversation": [
+            ("transportation", "What's the best way to get around tonight? Any transportation issues I should know about?")
+        ]
+    }
+]
+
+def _stats(results: Dict[str, bool]):
+    """Return (passed, total, all passed) for a dict of step results"""
+    values = list(results.values())
+    passed = sum(values)
+    return passed, len(values), passed == len(values)
+
+class AgenticLayerTester:
+    """Test suite for the City Pulse agentic layer"""
+    
+    def __init__(self):
+        self.base_url = BASE_URL
+        self.client = None
+    
+    async def __aenter__(self):
+        # Shared keep-alive client so every journey step reuses pooled connections
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=HTTP2_AVAILABLE,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=32)
         )
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.client:
+            await self.client.aclose()
+    
+    async def make_request(self, method: str, endpoint: str, data: Dict = None, timeout: int = 30) -> Dict[str, Any]:
+        """Make HTTP request with error handling"""
+        try:
+            start_time = time.time()
+            if method.upper() == "GET":
+                response = await self.client.get(endpoint, timeout=timeout)
+            elif method.upper() == "POST":
+                response = await self.client.post(endpoint, content=json_dumps(data), headers=JSON_HEADERS, timeout=timeout)
+            else:
+                raise ValueError(f"Unsupported method: {method}")
+            
+            response_time = (time.time() - start_time) * 1000  # ms
+            
+            if response.status_code == 200:
+                return {
+                    "success": True,
+                    "data": json_loads(response.content),
+                    "response_time_ms": response_time
+                }
+            else:
+                logger.info(f"❌ HTTP {response.status_code}: {response.text[:200]}")
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}: {response.text}",
+                    "response_time_ms": response_time
+                }
+                
+        except Exception as e:
+            logger.info(f"❌ Request failed: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "response_time_ms": 0
+            }
+    
+    async def test_agent_chat(self, user_id: str, message: str, location: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Send a chat message to the agent and report the response"""
+        logger.info(f"👤 User: {message}")
+        
+        chat_data = {
+            "user_id": user_id,
+            "message": message,
+            "location": location
+        }
         
-        # Step 4: Ask about weather impact
-        print(f"\n🌦️ Step 4: Check weather impact on commute")
-        chat_result_3 = self.test_agent_chat(
-            user["id"],
-            "Will the weather affect my commute today?",
-            user["location"]
-        )
+        result = await self.make_request("POST", "/agent/chat", chat_data)
         
-        # Step 5: Get personalized traffic insights
-        print(f"\n📈 Step 5: Get personalized traffic insights")
-        insights_result = self.test_insights_generation(user["id"], "traffic")
+        if result["success"]:
+            data = result["data"]
+            logger.info(f"🤖 Agent ({result['response_time_ms']:.0f}ms): {data.get('response', '')[:200]}...")
+            logger.info(f"   Suggested actions: {len(data.get('suggested_actions', []))}, knowledge used: {data.get('knowledge_used', 0)}")
         
-        # Step 6: Follow-up conversation
-        print(f"\n💬 Step 6: Follow-up conversation")
-        chat_result_4 = self.test_agent_chat(
-            user["id"],
-            "Thanks! Can you notify me if there are any incidents on ORR?",
-            user["location"]
-        )
+        return result
+    
+    async def test_agent_chat_batch(self, user_id: str, messages: List[str], location: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """Send several conversation turns in one request; returns one result per message, in order"""
+        for message in messages:
+            logger.info(f"👤 User: {message}")
+        
+        batch_data = {
+            "user_id": user_id,
+            "messages": messages,
+            "location": location
+        }
         
-        return {
-            "journey": "morning_commute",
-            "user": user["name"],
-            "steps": {
-                "dashboard": dashboard_result["success"],
-                "traffic_check": chat_result_1["success"],
-                "route_alternatives": chat_result_2["success"],
-                "weather_check": chat_result_3["success"],
-                "traffic_insights": insights_result["success"],
-                "follow_up": chat_result_4["success"]
+        result = await self.make_request("POST", "/agent/chat/batch", batch_data)
+        
+        responses = result["data"].get("responses", []) if result["success"] else []
+        if len(responses) != len(messages):
+            failure = result if not result["success"] else {
+                "success": False,
+                "error": f"Expected {len(messages)} responses, got {len(responses)}",
+                "response_time_ms": result["response_time_ms"]
             }
-        }
+            return [failure] * len(messages)
+        
+        results = []
+        for data in responses:
+            logger.info(f"🤖 Agent: {data.get('response', '')[:200]}...")
+            logger.info(f"   Suggested actions: {len(data.get('suggested_actions', []))}, knowledge used: {data.get('knowledge_used', 0)}")
+            results.append({
+                "success": data.get("success", False),
+                "data": data,
+                "response_time_ms": result["response_time_ms"]
+            })
+        logger.info(f"   Batch of {len(results)} turns answered in {result['response_time_ms']:.0f}ms")
+        
+        return results
     
-    def run_user_journey_2(self):
-        """
-        User Journey 2: Evening Event Discovery
-        Priya Sharma wants to find events and activities for the evening
-        """
-        print("\n" + "="*80)
-        print("🌆 USER JOURNEY 2: EVENING EVENT DISCOVERY")
-        print("User: Priya Sharma (Marketing Manager)")
-        print("Scenario: 6:00 PM, looking for evening activities in Koramangala area")
-        print("="*80)
-        
-        user = TEST_USERS[1]  # Priya Sharma
-        
-        # Step 1: Generate evening dashboard
-        print(f"\n📊 Step 1: Generate evening dashboard for {user['name']}")
-        dashboard_result = self.test_dashboard_generation(user["id"])
-        
-        # Step 2: Ask about local events
-        print(f"\n🎭 Step 2: Ask about local events")
-        chat_result_1 = self.test_agent_chat(
-            user["id"],
-            "What's happening in Koramangala tonight? Any interesting events or activities?",
-            user["location"]
-        )
+    async def test_dashboard_generation(self, user_id: str) -> Dict[str, Any]:
+        """Generate a personalized dashboard and report the cards"""
+        dashboard_data = {
+            "user_id": user_id,
+            "refresh": False  # served from the prefetch when it has run
+        }
         
-        # Step 3: Ask about restaurants and dining
-        print(f"\n🍽️ Step 3: Ask about dining options")
-        chat_result_2 = self.test_agent_chat(
-            user["id"],
-            "Any good restaurants open for dinner? Preferably places not affected by traffic or construction.",
-            user["location"]
-        )
+        result = await self.make_request("POST", "/agent/dashboard", dashboard_data)
         
-        # Step 4: Check weather for evening plans
-        print(f"\n🌙 Step 4: Check weather for evening")
-        chat_result_3 = self.test_agent_chat(
-            user["id"],
-            "Should I carry an umbrella? How's the weather looking for tonight?",
-            user["location"]
-        )
+        if result["success"]:
+            data = result["data"]
+            logger.info(f"✅ Dashboard generated ({result['response_time_ms']:.0f}ms): {data.get('total_cards', 0)} cards")
+            for card in data.get("cards", [])[:3]:
+                logger.info(f"   • {card.get('title', 'Untitled card')}")
         
-        # Step 5: Get personalized event insights
-        print(f"\n🎪 Step 5: Get personalized event insights")
-        insights_result = self.test_insights_generation(user["id"], "events")
+        return result
+    
+    async def prefetch_dashboards(self, user_ids: List[str]) -> Dict[str, Any]:
+        """Ask the server to precompute dashboards for the given users"""
+        return await self.make_request("POST", "/agent/prefetch", {"user_ids": user_ids})
+    
+    async def test_insights_generation(self, user_id: str, insight_type: str) -> Dict[str, Any]:
+        """Request personalized insights of the given type"""
+        insights_data = {
+            "user_id": user_id,
+            "insight_type": insight_type
+        }
         
-        # Step 6: Ask about transportation
-        print(f"\n🚕 Step 6: Ask about transportation")
-        chat_result_4 = self.test_agent_chat(
-            user["id"],
-            "What's the best way to get around tonight? Any transportation issues I should know about?",
-            user["location"]
+        result = await self.make_request("POST", "/agent/insights", insights_data)
+        
+        if result["success"]:
+            data = result["data"]
+            logger.info(f"✅ {insight_type.title()} insights ({result['response_time_ms']:.0f}ms): {data.get('insights', '')[:200]}...")
+            logger.info(f"   Data points used: {data.get('data_points_used', 0)}")
+        
+        return result
+    
+    async def _wait_for_history(self, user_id: str, message: str, timeout: float = 1.0) -> bool:
+        """Poll conversation history until the given user message is recorded (capped at timeout)"""
+        async def poll():
+            while True:
+                result = await self.make_request("GET", f"/agent/chat/{user_id}/history")
+                if result["success"]:
+                    history = result["data"].get("conversation_history", [])
+                    if any(msg.get("role") == "user" and msg.get("content") == message for msg in history[-2:]):
+                        return True
+                await asyncio.sleep(0.02)
+        
+        try:
+            return await asyncio.wait_for(poll(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+    
+    async def _run_journey(self, journey: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one entry of JOURNEYS: dashboard, insights and a 4-turn conversation"""
+        user = journey["user"]
+        logger.info("\n" + "="*80)
+        logger.info(journey["banner"])
+        logger.info(f"User: {user['name']} ({journey['role']})")
+        logger.info(f"Scenario: {journey['scenario']}")
+        logger.info("="*80)
+        
+        # Dashboard and insights don't depend on the conversation, so they
+        # run alongside it; the chat turns go out as one ordered batch
+        logger.info(f"\n📊 Step 1: Generate {journey['period']} dashboard for {user['name']}")
+        logger.info(f"\n{journey['insight_icon']} Step 5: Get personalized {journey['insight_type']} insights")
+        logger.info(f"\n💬 Steps 2-4, 6: {journey['conversation_summary']}")
+        turns = journey["conversation"] + journey["follow_up_conversation"]
+        messages = [message for _, message in turns]
+        dashboard_result, insights_result, chat_results = await asyncio.gather(
+            self.test_dashboard_generation(user["id"]),
+            self.test_insights_generation(user["id"], journey["insight_type"]),
+            self.test_agent_chat_batch(user["id"], messages, user["location"])
         )
         
+        chat_steps = {step: result["success"] for (step, _), result in zip(turns, chat_results)}
         return {
-            "journey": "evening_discovery",
+            "journey": journey["name"],
             "user": user["name"],
             "steps": {
                 "dashboard": dashboard_result["success"],
-                "event_discovery": chat_result_1["success"],
-                "dining_options": chat_result_2["success"],
-                "weather_check": chat_result_3["success"],
-                "event_insights": insights_result["success"],
-                "transportation": chat_result_4["success"]
+                **{step: chat_steps[step] for step, _ in journey["conversation"]},
+                journey["insight_step"]: insights_result["success"],
+                **{step: chat_steps[step] for step, _ in journey["follow_up_conversation"]}
             }
         }
     
-    def run_stress_tests(self):
+    async def run_stress_tests(self):
         """Run stress tests and edge cases"""
-        print("\n" + "="*80)
-        print("🔥 STRESS TESTS & EDGE CASES")
-        print("="*80)
+        logger.info("\n" + "="*80)
+        logger.info("🔥 STRESS TESTS & EDGE CASES")
+        logger.info("="*80)
         
         user = TEST_USERS[0]  # Use Arjun for stress tests
         
         # Test 1: Emergency scenario
-        print("\n🚨 Test 1: Emergency scenario")
-        emergency_result = self.test_agent_chat(
+        logger.info("\n🚨 Test 1: Emergency scenario")
+        emergency_result = await self.test_agent_chat(
             user["id"],
             "Emergency! There's been an accident on Silk Board junction. Need immediate help!",
             user["location"]
         )
         
         # Test 2: Complex multi-part query
-        print("\n🧩 Test 2: Complex multi-part query")
-        complex_result = self.test_agent_chat(
+        logger.info("\n🧩 Test 2: Complex multi-part query")
+        complex_result = await self.test_agent_chat(
             user["id"],
             "I need to get to a meeting in Whitefield by 3 PM, but I also need to pick up documents from Koramangala first. What's the best route considering current traffic, and should I take my car or use public transport? Also, are there any road closures I should know about?",
             user["location"]
         )
         
         # Test 3: Conversational context
-        print("\n💬 Test 3: Conversational context (follow-up)")
-        context_result_1 = self.test_agent_chat(
+        logger.info("\n💬 Test 3: Conversational context (follow-up)")
+        context_result_1 = await self.test_agent_chat(
             user["id"],
             "How's traffic on ORR?",
             user["location"]
         )
         
-        time.sleep(1)  # Brief pause
+        await self._wait_for_history(user["id"], "How's traffic on ORR?")
         
-        context_result_2 = self.test_agent_chat(
+        context_result_2 = await self.test_agent_chat(
             user["id"],
             "What about alternative routes to the same destination?",
             user["location"]
         )
         
         # Test 4: Location-specific queries
-        print("\n📍 Test 4: Location-specific queries")
-        location_result = self.test_agent_chat(
+        logger.info("\n📍 Test 4: Location-specific queries")
+        location_result = await self.test_agent_chat(
             user["id"],
             "Any infrastructure issues specifically in HSR Layout Sector 2?",
-            {"lat": 12.9116, "lng": 77.6370}  # HSR Layout
+            HSR_LAYOUT_LOCATION
         )
         
         # Test 5: Dashboard refresh
-        print("\n🔄 Test 5: Dashboard refresh")
-        refresh_result = self.make_request("GET", f"/agent/dashboard/{user['id']}?refresh=true")
+        logger.info("\n🔄 Test 5: Dashboard refresh")
+        refresh_result = await self.make_request("GET", f"/agent/dashboard/{user['id']}?refresh=true")
         
         return {
             "stress_tests": {
@@ -162,98 +374,120 @@
             }
         }
     
-    def test_system_health(self):
+    async def test_system_health(self):
         """Test system health and performance"""
-        print("\n" + "="*80)
-        print("🏥 SYSTEM HEALTH & PERFORMANCE TESTS")
-        print("="*80)
+        logger.info("\n" + "="*80)
+        logger.info("🏥 SYSTEM HEALTH & PERFORMANCE TESTS")
+        logger.info("="*80)
         
         # Test agentic endpoints
-        print("\n🔍 Testing agentic endpoints health...")
-        
-        # Test agent chat endpoint
-        print("   - Agent chat test endpoint...")
-        chat_health = self.make_request("GET", "/agent/test/chat")
-        
-        # Test dashboard test endpoint  
-        print("   - Dashboard test endpoint...")
-        dashboard_health = self.make_request("GET", "/agent/test/dashboard")
-        
-        # Test analytics endpoint
-        print("   - Analytics endpoint...")
-        analytics_health = self.make_request("GET", "/agent/analytics/usage")
-        
-        # Test conversation history
-        print("   - Conversation history...")
+        logger.info("\n🔍 Testing agentic endpoints health...")
+        
+        # Chat, dashboard, analytics and history checks are independent
+        logger.info("   - Agent chat test endpoint...")
+        logger.info("   - Dashboard test endpoint...")
+        logger.info("   - Analytics endpoint...")
+        logger.info("   - Conversation history...")
+        logger.info("   - Dashboard prefetch for test users...")
         user_id = TEST_USERS[0]["id"]
-        history_health = self.make_request("GET", f"/agent/chat/{user_id}/history")
+        chat_health, dashboard_health, analytics_health, history_health, prefetch = await asyncio.gather(
+            self.make_request("GET", "/agent/test/chat"),
+            self.make_request("GET", "/agent/test/dashboard"),
+            self.make_request("GET", "/agent/analytics/usage"),
+            self.make_request("GET", f"/agent/chat/{user_id}/history"),
+            self.prefetch_dashboards([user["id"] for user in TEST_USERS])
+        )
         
         health_results = {
             "chat_endpoint": chat_health["success"],
             "dashboard_endpoint": dashboard_health["success"],
             "analytics_endpoint": analytics_health["success"],
-            "history_endpoint": history_health["success"]
+            "history_endpoint": history_health["success"],
+            "dashboard_prefetch": prefetch["success"]
         }
         
-        print(f"✅ Health check results: {health_results}")
+        logger.info(f"✅ Health check results: {health_results}")
         return health_results
     
-    def run_full_test_suite(self):
+    async def run_full_test_suite(self):
         """Run the complete test suite"""
-        print("🚀 STARTING CITY PULSE AGENTIC LAYER TEST SUITE")
-        print("=" * 80)
+        logger.info("🚀 STARTING CITY PULSE AGENTIC LAYER TEST SUITE")
+        logger.info("=" * 80)
         
         start_time = time.time()
         
-        # System health check first
-        health_results = self.test_system_health()
-        
-        # User Journey 1: Morning Commute
-        journey_1_results = self.run_user_journey_1()
-        
-        # User Journey 2: Evening Discovery
-        journey_2_results = self.run_user_journey_2()
-        
-        # Stress tests
-        stress_test_results = self.run_stress_tests()
+        with open(RESULTS_STREAM_FILE, "wb") as results_stream:
+            # Each phase is written out as soon as it finishes, so partial
+            # results survive an interrupted run
+            async def recorded(phase, coro):
+                # Child tasks copy this context, so their output lands in the same buffer
+                buffer = []
+                token = _phase_output.set(buffer)
+                try:
+                    results = await coro
+                finally:
+                    _phase_output.reset(token)
+                    for record in buffer:
+                        _console_handler.handle(record)
+                results_stream.write(json_dumps({"phase": phase, **results}).encode() + b"\n")
+                results_stream.flush()
+                return results
+            
+            # Stress tests reuse Arjun's conversation, so they follow Journey 1
+            async def arjun_phases():
+                journey_1 = await recorded("journey_1", self._run_journey(JOURNEYS[0]))
+                stress = await recorded("stress_tests", self.run_stress_tests())
+                return journey_1, stress
+            
+            # Health checks, Priya's journey and Arjun's phases share no state
+            health_results, journey_2_results, (journey_1_results, stress_test_results) = await asyncio.gather(
+                recorded("health", self.test_system_health()),
+                recorded("journey_2", self._run_journey(JOURNEYS[1])),
+                arjun_phases()
+            )
         
         end_time = time.time()
         
         # Summary
-        print("\n" + "="*80)
-        print("📊 TEST SUITE SUMMARY")
-        print("="*80)
+        logger.info("\n" + "="*80)
+        logger.info("📊 TEST SUITE SUMMARY")
+        logger.info("="*80)
+        
+        logger.info(f"⏱️  Total execution time: {end_time - start_time:.2f} seconds")
         
-        print(f"⏱️  Total execution time: {end_time - start_time:.2f} seconds")
-        print(f"🏥 System Health: {'✅ PASS' if all(health_results.values()) else '❌ FAIL'}")
-        print(f"🌅 Journey 1 (Morning Commute): {'✅ PASS' if all(journey_1_results['steps'].values()) else '❌ FAIL'}")
-        print(f"🌆 Journey 2 (Evening Discovery): {'✅ PASS' if all(journey_2_results['steps'].values()) else '❌ FAIL'}")
-        print(f"🔥 Stress Tests: {'✅ PASS' if all(stress_test_results['stress_tests'].values()) else '❌ FAIL'}")
+        # One pass over each result dict: (passed, total, all passed)
+        health_passed, health_total, health_ok = _stats(health_results)
+        journey_1_passed, journey_1_total, journey_1_ok = _stats(journey_1_results['steps'])
+        journey_2_passed, journey_2_total, journey_2_ok = _stats(journey_2_results['steps'])
+        stress_passed, stress_total, stress_ok = _stats(stress_test_results['stress_tests'])
+        
+        logger.info(f"🏥 System Health: {'✅ PASS' if health_ok else '❌ FAIL'}")
+        logger.info(f"🌅 Journey 1 (Morning Commute): {'✅ PASS' if journey_1_ok else '❌ FAIL'}")
+        logger.info(f"🌆 Journey 2 (Evening Discovery): {'✅ PASS' if journey_2_ok else '❌ FAIL'}")
+        logger.info(f"🔥 Stress Tests: {'✅ PASS' if stress_ok else '❌ FAIL'}")
         
         # Detailed results
-        print(f"\n📋 Detailed Results:")
-        print(f"   Health Checks: {sum(health_results.values())}/{len(health_results)} passed")
-        print(f"   Journey 1 Steps: {sum(journey_1_results['steps'].values())}/{len(journey_1_results['steps'])} passed")
-        print(f"   Journey 2 Steps: {sum(journey_2_results['steps'].values())}/{len(journey_2_results['steps'])} passed")
-        print(f"   Stress Tests: {sum(stress_test_results['stress_tests'].values())}/{len(stress_test_results['stress_tests'])} passed")
+        logger.info(f"\n📋 Detailed Results:")
+        logger.info(f"   Health Checks: {health_passed}/{health_total} passed")
+        logger.info(f"   Journey 1 Steps: {journey_1_passed}/{journey_1_total} passed")
+        logger.info(f"   Journey 2 Steps: {journey_2_passed}/{journey_2_total} passed")
+        logger.info(f"   Stress Tests: {stress_passed}/{stress_total} passed")
         
         # Overall success rate
-        total_tests = (len(health_results) + len(journey_1_results['steps']) + 
-                      len(journey_2_results['steps']) + len(stress_test_results['stress_tests']))
-        passed_tests = (sum(health_results.values()) + sum(journey_1_results['steps'].values()) + 
-                       sum(journey_2_results['steps'].values()) + sum(stress_test_results['stress_tests'].values()))
+        total_tests = health_total + journey_1_total + journey_2_total + stress_total
+        passed_tests = health_passed + journey_1_passed + journey_2_passed + stress_passed
         
         success_rate = (passed_tests / total_tests) * 100
-        print(f"\n🎯 Overall Success Rate: {success_rate:.1f}% ({passed_tests}/{total_tests} tests passed)")
+        logger.info(f"\n🎯 Overall Success Rate: {success_rate:.1f}% ({passed_tests}/{total_tests} tests passed)")
         
         if success_rate >= 90:
-            print("🎉 EXCELLENT! Your agentic layer is working exceptionally well!")
+            logger.info("🎉 EXCELLENT! Your agentic layer is working exceptionally well!")
         elif success_rate >= 75:
-            print("👍 GOOD! Your agentic layer is working well with minor issues.")
+            logger.info("👍 GOOD! Your agentic layer is working well with minor issues.")
         elif success_rate >= 50:
-            print("⚠️  NEEDS WORK: Several components need attention.")
+            logger.info("⚠️  NEEDS WORK: Several components need attention.")
         else:
-            print("🚨 MAJOR ISSUES: Significant problems detected.")
+            logger.info("🚨 MAJOR ISSUES: Significant problems detected.")
         
         return {
             "summary": {
@@ -271,26 +505,23 @@
         }
 
 
-def main():
+async def main():
     """Main test execution"""
-    print("🏁 Initializing City Pulse Agentic Layer Tests...")
-    print("📋 Make sure your server is running at http://localhost:8000")
-    print("👥 Using existing test users: Arjun Kumar and Priya Sharma")
-    print("")
-    
-    # Initialize tester
-    tester = AgenticLayerTester()
+    logger.info("🏁 Initializing City Pulse Agentic Layer Tests...")
+    logger.info("📋 Make sure your server is running at http://localhost:8000")
+    logger.info("👥 Using existing test users: Arjun Kumar and Priya Sharma")
+    logger.info("")
     
-    # Run the full test suite
-    results = tester.run_full_test_suite()
+    # Initialize tester and run the full test suite
+    async with AgenticLayerTester() as tester:
+        results = await tester.run_full_test_suite()
     
     # Save results to file
-    with open("agentic_test_results.json", "w") as f:
-        json.dump(results, f, indent=2)
+    write_json_file("agentic_test_results.json", results)
     
-    print(f"\n💾 Test results saved to: agentic_test_results.json")
-    print("🎯 Test suite complete!")
+    logger.info(f"\n💾 Test results saved to: agentic_test_results.json (per-phase: {RESULTS_STREAM_FILE})")
+    logger.info("🎯 Test suite complete!")
 
 
 if __name__ == "__main__":
-    main()
+    run_main(main())
@@ -8,39 +8,176 @@ import asyncio
 import aiohttp
 import json
 import logging
+import argparse
 from datetime import datetime
+from pathlib import Path
 import sys
 import os
 
+from data.json_codec import json_dumps, json_loads
+from data.event_loop import run_main
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
 BASE_URL = "http://localhost:8000"
 
+# Request payloads shared by every run; built once at import time
+EVENT_DATA = {
+    "topic": "traffic",
+    "sub_topic": "accident",
+    "title": "Test traffic accident",
+    "description": "Multi-vehicle collision on test road",
+    "location": {"lat": 12.9716, "lng": 77.5946},
+    "address": "Test Location, Bengaluru",
+    "severity": "high",
+    "media_urls": []
+}
+
+ENHANCED_EVENT_DATA = {
+    "topic": "infrastructure",
+    "sub_topic": "power_outage",
+    "title": "Power outage in HSR Layout",
+    "description": "Electricity supply disrupted affecting multiple buildings",
+    "location": {"lat": 12.9116, "lng": 77.6370},
+    "address": "HSR Layout, Bengaluru",
+    "severity": "medium",
+    "media_files": [],
+    "media_urls": [],
+    "reporter_context": {"witness": True}
+}
+
+SEARCH_PARAMS = {
+    "query": "traffic accident",
+    "lat": 12.9716,
+    "lng": 77.5946,
+    "radius_km": 10,
+    "max_results": 5
+}
+
+NEARBY_PARAMS = {
+    "lat": 12.9716,
+    "lng": 77.5946,
+    "radius_km": 5,
+    "max_results": 10
+}
+
+MEDIA_ANALYSIS_DATA = {
+    "media_url": "gs://bucket/test_image.jpg",
+    "media_type": "image"
+}
+
+CHAT_DATA = {
+    "user_id": "test_user",
+    "message": "What's the traffic like on ORR?",
+    "location": {"lat": 12.9716, "lng": 77.5946},
+    "context": {}
+}
+
+ENHANCED_CHAT_DATA = {
+    "user_id": "test_user",
+    "message": "Can you analyze this traffic scene?",
+    "location": {"lat": 12.9716, "lng": 77.5946},
+    "context": {},
+    "media_references": ["gs://bucket/traffic_scene.jpg"],
+    "include_media_analysis": True
+}
+
+ANALYTICS_PARAMS = {"timeframe": "24h"}
+
+HEATMAP_PARAMS = {"timeframe": "24h"}
+
+DEMO_DATA = {"events_count": 10, "users_count": 3}
+
+# On-disk ETag cache for static GET responses, reused across suite runs
+CACHE_FILE = Path(".cache/api.json")
+CACHEABLE_ENDPOINTS = {"/media/formats", "/demo/test-scenarios"}
+
+class CachedHTTP:
+    """GET response cache keyed by (method, url, params).
+    
+    Entries are only kept for responses carrying an ETag and are always
+    revalidated with If-None-Match, so every test still reaches the server.
+    """
+    
+    def __init__(self, path: Path = CACHE_FILE, refresh: bool = False):
+        self.path = path
+        self.entries = {}
+        if not refresh and path.exists():
+            try:
+                self.entries = json.loads(path.read_text())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable API cache {path}: {e}")
+    
+    @staticmethod
+    def make_key(method: str, url: str, params=None) -> str:
+        return f"{method} {url} {json.dumps(sorted((params or {}).items()))}"
+    
+    def get(self, key: str):
+        """Return the cached entry for key, if any"""
+        return self.entries.get(key)
+    
+    def put(self, key: str, etag, body):
+        if etag:
+            self.entries[key] = {"etag": etag, "body": body}
+        else:
+            # Without an ETag there is nothing to revalidate against
+            self.entries.pop(key, None)
+    
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries))
+
 class APITester:
     """Test all FastAPI endpoints"""
     
-    def __init__(self):
+    def __init__(self, refresh: bool = False):
         self.session = None
         self.test_results = {}
+        self.cache = CachedHTTP(refresh=refresh)
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # One tuned keep-alive pool shared by every endpoint test
+        connector = aiohttp.TCPConnector(
+            limit_per_host=64,
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+            use_dns_cache=True
+        )
+        # Resolving endpoints against a parsed base URL skips rebuilding the full URL per call
+        self.session = aiohttp.ClientSession(
+            base_url=BASE_URL,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            json_serialize=json_dumps
+        )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
+        self.cache.save()
     
-    async def test_endpoint(self, method: str, endpoint: str, data=None, files=None):
-        """Test a single endpoint"""
+    async def test_endpoint(self, method: str, endpoint: str, data=None, files=None, fields=None):
+        """Test a single endpoint, optionally asking the server for only `fields`"""
         try:
-            url = f"{BASE_URL}{endpoint}"
-            
             if method.upper() == "GET":
-                async with self.session.get(url, params=data) as response:
-                    result = await response.json()
+                if fields:
+                    data = {**(data or {}), "fields": fields}
+                cache_key, entry, headers = None, None, None
+                if endpoint in CACHEABLE_ENDPOINTS:
+                    cache_key = CachedHTTP.make_key("GET", BASE_URL + endpoint, data)
+                    entry = self.cache.get(cache_key)
+                    if entry:
+                        headers = {"If-None-Match": entry["etag"]}
+                
+                async with self.session.get(endpoint, params=data, headers=headers) as response:
+                    if response.status == 304 and entry:
+                        return 200, entry["body"]
+                    result = json_loads(await response.read())
+                    if cache_key and response.status == 200:
+                        self.cache.put(cache_key, response.headers.get("ETag"), result)
                     return response.status, result
             
             elif method.upper() == "POST":
@@ -52,12 +189,12 @@ class APITester:
                             form_data.add_field(key, str(value))
                     # Note: File upload testing would need actual files
                     
-                    async with self.session.post(url, data=form_data) as response:
-                        result = await response.json()
+                    async with self.session.post(endpoint, data=form_data) as response:
+                        result = json_loads(await response.read())
                         return response.status, result
                 else:
-                    async with self.session.post(url, json=data) as response:
-                        result = await response.json()
+                    async with self.session.post(endpoint, json=data) as response:
+                        result = json_loads(await response.read())
                         return response.status, result
             
         except Exception as e:
@@ -69,9 +206,18 @@ class APITester:
         print("🧪 Testing City Pulse Agent FastAPI")
         print("=" * 50)
         
+        # One timestamp for the whole run
+        now_iso = datetime.utcnow().isoformat()
+        
+        # Health and root checks are independent
+        health_response, root_response = await asyncio.gather(
+            self.test_endpoint("GET", "/health"),
+            self.test_endpoint("GET", "/")
+        )
+        
         # Test 1: Health Check
         print("\n1. 🏥 Testing Health Check...")
-        status, result = await self.test_endpoint("GET", "/health")
+        status, result = health_response
         if status == 200:
             print(f"✅ Health check passed: {result.get('status')}")
             self.test_results["health"] = True
@@ -81,7 +227,7 @@ class APITester:
         
         # Test 2: Root endpoint
         print("\n2. 🏠 Testing Root Endpoint...")
-        status, result = await self.test_endpoint("GET", "/")
+        status, result = root_response
         if status == 200:
             print(f"✅ Root endpoint: {result.get('message')}")
             self.test_results["root"] = True
@@ -89,20 +235,15 @@ class APITester:
             print(f"❌ Root endpoint failed: {status}")
             self.test_results["root"] = False
         
+        # Event creation runs before search so the new events can be found
+        create_event_response, create_enhanced_response = await asyncio.gather(
+            self.test_endpoint("POST", "/events", EVENT_DATA),
+            self.test_endpoint("POST", "/events/enhanced", {**ENHANCED_EVENT_DATA, "timestamp": now_iso})
+        )
+        
         # Test 3: Create Basic Event
         print("\n3. 📝 Testing Basic Event Creation...")
-        event_data = {
-            "topic": "traffic",
-            "sub_topic": "accident",
-            "title": "Test traffic accident",
-            "description": "Multi-vehicle collision on test road",
-            "location": {"lat": 12.9716, "lng": 77.5946},
-            "address": "Test Location, Bengaluru",
-            "severity": "high",
-            "media_urls": []
-        }
-        
-        status, result = await self.test_endpoint("POST", "/events", event_data)
+        status, result = create_event_response
         if status == 200 and result.get("success"):
             print(f"✅ Event created: {result.get('event_id')}")
             self.test_results["create_event"] = True
@@ -113,21 +254,7 @@ class APITester:
         
         # Test 4: Enhanced Event Creation
         print("\n4. 🎬 Testing Enhanced Event Creation...")
-        enhanced_data = {
-            "topic": "infrastructure",
-            "sub_topic": "power_outage",
-            "title": "Power outage in HSR Layout",
-            "description": "Electricity supply disrupted affecting multiple buildings",
-            "location": {"lat": 12.9116, "lng": 77.6370},
-            "address": "HSR Layout, Bengaluru",
-            "severity": "medium",
-            "media_files": [],
-            "media_urls": [],
-            "reporter_context": {"witness": True},
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        status, result = await self.test_endpoint("POST", "/events/enhanced", enhanced_data)
+        status, result = create_enhanced_response
         if status == 200 and result.get("success"):
             print(f"✅ Enhanced event created: {result.get('event_id')}")
             self.test_results["create_enhanced_event"] = True
@@ -135,17 +262,22 @@ class APITester:
             print(f"❌ Enhanced event creation failed: {status}")
             self.test_results["create_enhanced_event"] = False
         
+        # Search, media, chat and analytics tests are independent of each other
+        (search_response, nearby_response, media_formats_response, media_analysis_response,
+         chat_response, enhanced_chat_response, analytics_response, heatmap_response) = await asyncio.gather(
+            self.test_endpoint("GET", "/events/search", SEARCH_PARAMS, fields="success,total_results"),
+            self.test_endpoint("GET", "/events/nearby", NEARBY_PARAMS, fields="success,total_events"),
+            self.test_endpoint("GET", "/media/formats"),
+            self.test_endpoint("POST", "/media/analyze", MEDIA_ANALYSIS_DATA),
+            self.test_endpoint("POST", "/chat", CHAT_DATA),
+            self.test_endpoint("POST", "/chat/enhanced", ENHANCED_CHAT_DATA),
+            self.test_endpoint("GET", "/analytics/overview", ANALYTICS_PARAMS),
+            self.test_endpoint("GET", "/analytics/heatmap", HEATMAP_PARAMS, fields="success,total_points")
+        )
+        
         # Test 5: Event Search
         print("\n5. 🔍 Testing Event Search...")
-        search_params = {
-            "query": "traffic accident",
-            "lat": 12.9716,
-            "lng": 77.5946,
-            "radius_km": 10,
-            "max_results": 5
-        }
-        
-        status, result = await self.test_endpoint("GET", "/events/search", search_params)
+        status, result = search_response
         if status == 200 and result.get("success"):
             print(f"✅ Search completed: {result.get('total_results')} results")
             self.test_results["search_events"] = True
@@ -155,14 +287,7 @@ class APITester:
         
         # Test 6: Nearby Events
         print("\n6. 📍 Testing Nearby Events...")
-        nearby_params = {
-            "lat": 12.9716,
-            "lng": 77.5946,
-            "radius_km": 5,
-            "max_results": 10
-        }
-        
-        status, result = await self.test_endpoint("GET", "/events/nearby", nearby_params)
+        status, result = nearby_response
         if status == 200 and result.get("success"):
             print(f"✅ Nearby events: {result.get('total_events')} found")
             self.test_results["nearby_events"] = True
@@ -172,7 +297,7 @@ class APITester:
         
         # Test 7: Media Formats
         print("\n7. 📁 Testing Media Formats...")
-        status, result = await self.test_endpoint("GET", "/media/formats")
+        status, result = media_formats_response
         if status == 200 and result.get("success"):
             formats = result.get("formats", {})
             print(f"✅ Media formats: {len(formats.get('images', []))} image, {len(formats.get('videos', []))} video")
@@ -183,12 +308,7 @@ class APITester:
         
         # Test 8: Media Analysis
         print("\n8. 🤖 Testing Media Analysis...")
-        analysis_data = {
-            "media_url": "gs://bucket/test_image.jpg",
-            "media_type": "image"
-        }
-        
-        status, result = await self.test_endpoint("POST", "/media/analyze", analysis_data)
+        status, result = media_analysis_response
         if status == 200:
             print(f"✅ Media analysis: confidence {result.get('confidence_score', 0):.2f}")
             self.test_results["media_analysis"] = True
@@ -198,14 +318,7 @@ class APITester:
         
         # Test 9: Basic Chat
         print("\n9. 💬 Testing Basic Chat...")
-        chat_data = {
-            "user_id": "test_user",
-            "message": "What's the traffic like on ORR?",
-            "location": {"lat": 12.9716, "lng": 77.5946},
-            "context": {}
-        }
-        
-        status, result = await self.test_endpoint("POST", "/chat", chat_data)
+        status, result = chat_response
         if status == 200:
             print(f"✅ Chat response: {len(result.get('suggestions', []))} suggestions")
             self.test_results["chat"] = True
@@ -215,16 +328,7 @@ class APITester:
         
         # Test 10: Enhanced Chat
         print("\n10. 🎥 Testing Enhanced Chat...")
-        enhanced_chat_data = {
-            "user_id": "test_user",
-            "message": "Can you analyze this traffic scene?",
-            "location": {"lat": 12.9716, "lng": 77.5946},
-            "context": {},
-            "media_references": ["gs://bucket/traffic_scene.jpg"],
-            "include_media_analysis": True
-        }
-        
-        status, result = await self.test_endpoint("POST", "/chat/enhanced", enhanced_chat_data)
+        status, result = enhanced_chat_response
         if status == 200:
             print(f"✅ Enhanced chat: {bool(result.get('media_insights'))} media insights")
             self.test_results["enhanced_chat"] = True
@@ -234,9 +338,7 @@ class APITester:
         
         # Test 11: Analytics Overview
         print("\n11. 📊 Testing Analytics...")
-        analytics_params = {"timeframe": "24h"}
-        
-        status, result = await self.test_endpoint("GET", "/analytics/overview", analytics_params)
+        status, result = analytics_response
         if status == 200 and result.get("success"):
             analytics = result.get("analytics", {})
             print(f"✅ Analytics: {analytics.get('total_events', 0)} total events")
@@ -247,9 +349,7 @@ class APITester:
         
         # Test 12: Heatmap Data
         print("\n12. 🗺️ Testing Heatmap...")
-        heatmap_params = {"timeframe": "24h"}
-        
-        status, result = await self.test_endpoint("GET", "/analytics/heatmap", heatmap_params)
+        status, result = heatmap_response
         if status == 200 and result.get("success"):
             points = result.get("total_points", 0)
             print(f"✅ Heatmap: {points} data points")
@@ -258,13 +358,17 @@ class APITester:
             print(f"❌ Heatmap failed: {status}")
             self.test_results["heatmap"] = False
         
+        # Demo population and scenario listing are independent
+        demo_response, scenarios_response = await asyncio.gather(
+            self.test_endpoint("POST", "/demo/populate", DEMO_DATA),
+            self.test_endpoint("GET", "/demo/test-scenarios")
+        )
+        
         # Test 13: Demo Data Population
         print("\n13. 🎭 Testing Demo Data Population...")
-        demo_data = {"events_count": 10, "users_count": 3}
-        
-        status, result = await self.test_endpoint("POST", "/demo/populate", demo_data)
+        status, result = demo_response
         if status == 200 and result.get("success"):
-            print(f"✅ Demo data: {demo_data['events_count']} events, {demo_data['users_count']} users")
+            print(f"✅ Demo data: {DEMO_DATA['events_count']} events, {DEMO_DATA['users_count']} users")
             self.test_results["demo_data"] = True
         else:
             print(f"❌ Demo data failed: {status}")
@@ -272,7 +376,7 @@ class APITester:
         
         # Test 14: Test Scenarios
         print("\n14. 🎯 Testing Demo Scenarios...")
-        status, result = await self.test_endpoint("GET", "/demo/test-scenarios")
+        status, result = scenarios_response
         if status == 200 and result.get("success"):
             scenarios = len(result.get("scenarios", []))
             print(f"✅ Test scenarios: {scenarios} available")
@@ -313,7 +417,7 @@ class APITester:
         else:
             print(f"\n⚠️ {total - passed} tests failed. Check server logs.")
 
-async def main():
+async def main(refresh: bool = False):
     """Run API tests"""
     print("🚀 Starting FastAPI Test Suite")
     print("Make sure the server is running on http://localhost:8000")
@@ -321,11 +425,14 @@ async def main():
     print()
     
     try:
-        async with APITester() as tester:
+        async with APITester(refresh=refresh) as tester:
             await tester.run_all_tests()
     except Exception as e:
         print(f"💥 Test suite failed: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="City Pulse Agent API tests")
+    parser.add_argument("--refresh", action="store_true", help="Drop cached ETags from previous runs")
+    args = parser.parse_args()
+    run_main(main(refresh=args.refresh))
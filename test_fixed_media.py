@@ -6,20 +6,17 @@ Test script for fixed media capabilities
 import asyncio
 import logging
 import sys
-import os
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
-# Add current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from data.processors.enhanced_event_processor import enhanced_processor
 from data.models.media_schemas import (
     MediaFile, EnhancedEventCreateRequest
 )
 from data.models.schemas import EventTopic, EventSeverity
+from data.event_loop import run_main
 
 async def test_fixed_issues():
     """Test the fixed media analysis issues"""
@@ -89,9 +86,14 @@ async def test_fixed_issues():
             ("gs://bucket/accident_scene.jpg", "image")
         ]
         
+        # Each analysis is an independent Gemini round-trip, so run them together
+        analyses = await asyncio.gather(*(
+            enhanced_processor.analyze_media_comprehensive(media_url, media_type)
+            for media_url, media_type in test_cases
+        ))
+        
         successful_analyses = 0
-        for media_url, media_type in test_cases:
-            analysis = await enhanced_processor.analyze_media_comprehensive(media_url, media_type)
+        for (media_url, media_type), analysis in zip(test_cases, analyses):
             if analysis and hasattr(analysis, 'gemini_description'):
                 successful_analyses += 1
                 print(f"   ✅ {media_type}: {media_url.split('/')[-1]}")
@@ -140,4 +142,4 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
@@ -4,13 +4,19 @@ Comprehensive test script for Google ADK-based Agentic Layer
 Tests both the new ADK implementation and compares with the existing one
 """
 
+import aiohttp
 import asyncio
-import json
 import logging
-import requests
+import threading
 import time
-from datetime import datetime
-from typing import Dict, Any, List
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from data.json_codec import json_loads, write_json_file
+
+def _now_iso() -> str:
+    """Current UTC time for result timestamps (timezone-aware; utcnow() is deprecated)"""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +28,46 @@ BASE_URL = "http://localhost:8000"
 class ADKAgentTester:
     """Test suite for Google ADK-based agentic layer"""
     
+    # Response-time probe: message template and base location (MG Road),
+    # shifted per request so each probe asks about a different area
+    PERF_MESSAGE_TEMPLATE = "Test message {i}: How is traffic in area {i}?"
+    PERF_BASE_LOCATION = {"lat": 12.9716, "lng": 77.5946}
+    PERF_REQUESTS = 5
+    
+    # Default per-request timeout in seconds, applied at the session level
+    REQUEST_TIMEOUT = 30
+    
+    # Tests that need exactly one independent request: (method, endpoint, payload).
+    # They are sent as one batch and each result goes to the matching check_* method.
+    SINGLE_REQUEST_TESTS = {
+        "adk_installation_status": ("GET", "/adk/test/status", None),
+        "adk_agents_info": ("GET", "/adk/analytics/agents", None),
+        "adk_chat_basic": ("POST", "/adk/chat", {
+            "user_id": "adk_test_user_001",
+            "message": "Hello! How is traffic in Bengaluru today?",
+            "location": {
+                "lat": 12.9716,
+                "lng": 77.5946
+            }
+        }),
+        "adk_dashboard_generation": ("POST", "/adk/dashboard", {
+            "user_id": "adk_test_user_004",
+            "refresh": True,
+            "max_cards": 4
+        }),
+        "adk_dashboard_filtering": ("POST", "/adk/dashboard", {
+            "user_id": "adk_test_user_005",
+            "card_types": ["traffic_alert", "weather_warning"],
+            "max_cards": 2
+        }),
+        "adk_insights_generation": ("POST", "/adk/insights", {
+            "user_id": "adk_test_user_006",
+            "insight_type": "traffic",
+            "timeframe": "24h",
+            "include_predictions": True
+        })
+    }
+    
     def __init__(self):
         self.base_url = BASE_URL
         self.test_results = {
@@ -30,51 +76,82 @@ class ADKAgentTester:
             "performance_metrics": {},
             "user_journeys": []
         }
+        # Running [passed, failed] counts per category, kept by log_test_result
+        self.tally = {category: [0, 0] for category in ("adk_tests", "comparison_tests", "user_journeys")}
+        self.session = None
+        self.results_writer = None  # Background thread writing the results file
+    
+    async def __aenter__(self):
+        # One session so every test request reuses pooled connections. At most 6
+        # requests are in flight at once: the batch of 6 single-request tests, or
+        # the 4 multi-request tests where only the two comparisons send 2 at a time.
+        # Every request goes to the same host, so the per-host cap matches the total
+        connector = aiohttp.TCPConnector(
+            limit=6,
+            limit_per_host=6,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            await self.session.close()
     
     def log_test_result(self, test_name: str, success: bool, details: Dict[str, Any], test_type: str = "adk_tests"):
         """Log test result"""
         result = {
             "test_name": test_name,
             "success": success,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "details": details
         }
         self.test_results[test_type].append(result)
+        self.tally[test_type][0 if success else 1] += 1
         
         status = "✅ PASS" if success else "❌ FAIL"
-        logger.info(f"{status} - {test_name}")
+        logger.info("%s - %s", status, test_name)
         if not success:
-            logger.error(f"  Error: {details.get('error', 'Unknown error')}")
+            logger.error("  Error: %s", details.get('error', 'Unknown error'))
     
-    def make_request(self, method: str, endpoint: str, data: Dict = None, timeout: int = 30) -> Dict[str, Any]:
+    async def make_request(self, method: str, endpoint: str, data: Dict = None, timeout: Optional[int] = None) -> Dict[str, Any]:
         """Make HTTP request with error handling"""
         try:
             url = f"{self.base_url}{endpoint}"
+            # Fall back to the session-wide timeout unless the caller overrides it
+            request_kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
             
-            start_time = time.time()
+            start_time = time.perf_counter()
             if method.upper() == "GET":
-                response = requests.get(url, timeout=timeout)
+                request = self.session.get(url, **request_kwargs)
             elif method.upper() == "POST":
-                response = requests.post(url, json=data, timeout=timeout)
+                request = self.session.post(url, json=data, **request_kwargs)
             else:
                 raise ValueError(f"Unsupported method: {method}")
             
-            response_time = (time.time() - start_time) * 1000  # ms
-            
-            if response.status_code == 200:
-                return {
-                    "success": True,
-                    "data": response.json(),
-                    "response_time_ms": response_time,
-                    "status_code": response.status_code
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"HTTP {response.status_code}: {response.text}",
-                    "response_time_ms": response_time,
-                    "status_code": response.status_code
-                }
+            async with request as response:
+                # Time to response headers, like requests' response.elapsed; excludes body decoding
+                response_time = (time.perf_counter() - start_time) * 1000  # ms
+                if response.status == 200:
+                    body = json_loads(await response.read())
+                    return {
+                        "success": True,
+                        "data": body,
+                        "response_time_ms": response_time,
+                        "status_code": response.status
+                    }
+                else:
+                    body = await response.text()
+                    return {
+                        "success": False,
+                        "error": f"HTTP {response.status}: {body}",
+                        "response_time_ms": response_time,
+                        "status_code": response.status
+                    }
                 
         except Exception as e:
             return {
@@ -87,10 +164,8 @@ class ADKAgentTester:
     # ADK AGENT STATUS AND SETUP TESTS
     # =========================================================================
     
-    def test_adk_installation_status(self):
+    def check_adk_installation_status(self, result: Dict[str, Any]) -> bool:
         """Test if Google ADK is properly installed and configured"""
-        result = self.make_request("GET", "/adk/test/status")
-        
         if result["success"]:
             data = result["data"]
             adk_available = data.get("adk_installed", False)
@@ -116,10 +191,8 @@ class ADKAgentTester:
             )
             return False
     
-    def test_adk_agents_info(self):
+    def check_adk_agents_info(self, result: Dict[str, Any]):
         """Test ADK agents information endpoint"""
-        result = self.make_request("GET", "/adk/analytics/agents")
-        
         if result["success"]:
             data = result["data"]
             agents_count = data.get("agents_count", 0)
@@ -144,19 +217,8 @@ class ADKAgentTester:
     # ADK CONVERSATION TESTS
     # =========================================================================
     
-    def test_adk_chat_basic(self):
+    def check_adk_chat_basic(self, result: Dict[str, Any]):
         """Test basic ADK chat functionality"""
-        chat_data = {
-            "user_id": "adk_test_user_001",
-            "message": "Hello! How is traffic in Bengaluru today?",
-            "location": {
-                "lat": 12.9716,
-                "lng": 77.5946
-            }
-        }
-        
-        result = self.make_request("POST", "/adk/chat", chat_data)
-        
         if result["success"]:
             data = result["data"]
             response_length = len(data.get("response", ""))
@@ -180,7 +242,7 @@ class ADKAgentTester:
                 {"error": result["error"]}
             )
     
-    def test_adk_chat_context_aware(self):
+    async def test_adk_chat_context_aware(self):
         """Test ADK context awareness in conversation"""
         user_id = "adk_test_user_002"
         
@@ -191,7 +253,7 @@ class ADKAgentTester:
             "location": {"lat": 12.8456, "lng": 77.6603}
         }
         
-        result1 = self.make_request("POST", "/adk/chat", first_message)
+        result1 = await self.make_request("POST", "/adk/chat", first_message)
         
         # Follow-up message (should understand context)
         follow_up = {
@@ -199,7 +261,7 @@ class ADKAgentTester:
             "message": "What about alternative routes?"
         }
         
-        result2 = self.make_request("POST", "/adk/chat", follow_up)
+        result2 = await self.make_request("POST", "/adk/chat", follow_up)
         
         success = (result1["success"] and result2["success"] and 
                   len(result2["data"].get("response", "")) > 10)
@@ -214,7 +276,7 @@ class ADKAgentTester:
             }
         )
     
-    def test_adk_conversation_history(self):
+    async def test_adk_conversation_history(self):
         """Test conversation history functionality"""
         user_id = "adk_test_user_003"
         
@@ -224,10 +286,10 @@ class ADKAgentTester:
             "message": "Tell me about weather in HSR Layout"
         }
         
-        chat_result = self.make_request("POST", "/adk/chat", chat_data)
+        chat_result = await self.make_request("POST", "/adk/chat", chat_data)
         
         # Get conversation history
-        history_result = self.make_request("GET", f"/adk/chat/{user_id}/history")
+        history_result = await self.make_request("GET", f"/adk/chat/{user_id}/history")
         
         if history_result["success"]:
             data = history_result["data"]
@@ -253,16 +315,8 @@ class ADKAgentTester:
     # ADK DASHBOARD TESTS
     # =========================================================================
     
-    def test_adk_dashboard_generation(self):
+    def check_adk_dashboard_generation(self, result: Dict[str, Any]):
         """Test ADK dashboard content generation"""
-        dashboard_data = {
-            "user_id": "adk_test_user_004",
-            "refresh": True,
-            "max_cards": 4
-        }
-        
-        result = self.make_request("POST", "/adk/dashboard", dashboard_data)
-        
         if result["success"]:
             data = result["data"]
             cards_count = data.get("total_cards", 0)
@@ -285,16 +339,8 @@ class ADKAgentTester:
                 {"error": result["error"]}
             )
     
-    def test_adk_dashboard_filtering(self):
+    def check_adk_dashboard_filtering(self, result: Dict[str, Any]):
         """Test dashboard card type filtering"""
-        dashboard_data = {
-            "user_id": "adk_test_user_005",
-            "card_types": ["traffic_alert", "weather_warning"],
-            "max_cards": 2
-        }
-        
-        result = self.make_request("POST", "/adk/dashboard", dashboard_data)
-        
         if result["success"]:
             data = result["data"]
             cards = data.get("cards", [])
@@ -320,17 +366,8 @@ class ADKAgentTester:
     # ADK INSIGHTS TESTS
     # =========================================================================
     
-    def test_adk_insights_generation(self):
+    def check_adk_insights_generation(self, result: Dict[str, Any]):
         """Test ADK insights generation"""
-        insights_data = {
-            "user_id": "adk_test_user_006",
-            "insight_type": "traffic",
-            "timeframe": "24h",
-            "include_predictions": True
-        }
-        
-        result = self.make_request("POST", "/adk/insights", insights_data)
-        
         if result["success"]:
             data = result["data"]
             insights_length = len(data.get("insights", ""))
@@ -358,7 +395,7 @@ class ADKAgentTester:
     # COMPARISON TESTS (ADK vs Original)
     # =========================================================================
     
-    def test_compare_chat_performance(self):
+    async def test_compare_chat_performance(self):
         """Compare ADK vs original agent chat performance"""
         test_message = {
             "user_id": "comparison_test_user",
@@ -366,11 +403,11 @@ class ADKAgentTester:
             "location": {"lat": 12.9352, "lng": 77.6245}
         }
         
-        # Test original agent
-        original_result = self.make_request("POST", "/agent/chat", test_message)
-        
-        # Test ADK agent  
-        adk_result = self.make_request("POST", "/adk/chat", test_message)
+        # The two agents share no state, so query them side by side
+        original_result, adk_result = await asyncio.gather(
+            self.make_request("POST", "/agent/chat", test_message),
+            self.make_request("POST", "/adk/chat", test_message)
+        )
         
         comparison = {
             "original_success": original_result["success"],
@@ -391,15 +428,15 @@ class ADKAgentTester:
             "comparison_tests"
         )
     
-    def test_compare_dashboard_performance(self):
+    async def test_compare_dashboard_performance(self):
         """Compare ADK vs original dashboard generation"""
         test_data = {"user_id": "comparison_dashboard_user", "refresh": True}
         
-        # Test original dashboard
-        original_result = self.make_request("POST", "/agent/dashboard", test_data)
-        
-        # Test ADK dashboard
-        adk_result = self.make_request("POST", "/adk/dashboard", test_data)
+        # Original and ADK dashboards are independent, so generate them together
+        original_result, adk_result = await asyncio.gather(
+            self.make_request("POST", "/agent/dashboard", test_data),
+            self.make_request("POST", "/adk/dashboard", test_data)
+        )
         
         comparison = {
             "original_success": original_result["success"],
@@ -423,8 +460,8 @@ class ADKAgentTester:
     # USER JOURNEY TESTS
     # =========================================================================
     
-    def test_user_journey_morning_commute(self):
-        """Test complete morning commute user journey with ADK"""
+    async def test_user_journey_morning_commute(self):
+        """Test complete morning commute user journey with ADK; returns (name, success, details)"""
         user_id = "journey_user_morning"
         journey_steps = []
         
@@ -435,7 +472,7 @@ class ADKAgentTester:
             "location": {"lat": 12.9716, "lng": 77.5946}
         }
         
-        result1 = self.make_request("POST", "/adk/chat", step1)
+        result1 = await self.make_request("POST", "/adk/chat", step1)
         journey_steps.append({"step": "traffic_inquiry", "success": result1["success"]})
         
         # Step 2: Ask for alternatives
@@ -444,34 +481,33 @@ class ADKAgentTester:
             "message": "What are some alternative routes?"
         }
         
-        result2 = self.make_request("POST", "/adk/chat", step2)
+        result2 = await self.make_request("POST", "/adk/chat", step2)
         journey_steps.append({"step": "alternatives", "success": result2["success"]})
         
         # Step 3: Generate dashboard
         dashboard_data = {"user_id": user_id, "refresh": True}
-        result3 = self.make_request("POST", "/adk/dashboard", dashboard_data)
+        result3 = await self.make_request("POST", "/adk/dashboard", dashboard_data)
         journey_steps.append({"step": "dashboard", "success": result3["success"]})
         
         # Step 4: Get insights
         insights_data = {"user_id": user_id, "insight_type": "traffic"}
-        result4 = self.make_request("POST", "/adk/insights", insights_data)
+        result4 = await self.make_request("POST", "/adk/insights", insights_data)
         journey_steps.append({"step": "insights", "success": result4["success"]})
         
         all_successful = all(step["success"] for step in journey_steps)
         
-        self.log_test_result(
+        return (
             "Morning Commute Journey",
             all_successful,
             {
                 "steps_completed": len([s for s in journey_steps if s["success"]]),
                 "total_steps": len(journey_steps),
                 "journey_details": journey_steps
-            },
-            "user_journeys"
+            }
         )
     
-    def test_user_journey_evening_discovery(self):
-        """Test evening event discovery user journey with ADK"""
+    async def test_user_journey_evening_discovery(self):
+        """Test evening event discovery user journey with ADK; returns (name, success, details)"""
         user_id = "journey_user_evening"
         journey_steps = []
         
@@ -482,7 +518,7 @@ class ADKAgentTester:
             "location": {"lat": 12.9352, "lng": 77.6245}
         }
         
-        result1 = self.make_request("POST", "/adk/chat", step1)
+        result1 = await self.make_request("POST", "/adk/chat", step1)
         journey_steps.append({"step": "event_inquiry", "success": result1["success"]})
         
         # Step 2: Ask about weather
@@ -491,7 +527,7 @@ class ADKAgentTester:
             "message": "Should I carry an umbrella tonight?"
         }
         
-        result2 = self.make_request("POST", "/adk/chat", step2)
+        result2 = await self.make_request("POST", "/adk/chat", step2)
         journey_steps.append({"step": "weather_check", "success": result2["success"]})
         
         # Step 3: Generate personalized dashboard
@@ -500,40 +536,42 @@ class ADKAgentTester:
             "card_types": ["event_recommendation", "weather_warning"],
             "max_cards": 3
         }
-        result3 = self.make_request("POST", "/adk/dashboard", dashboard_data)
+        result3 = await self.make_request("POST", "/adk/dashboard", dashboard_data)
         journey_steps.append({"step": "evening_dashboard", "success": result3["success"]})
         
         all_successful = all(step["success"] for step in journey_steps)
         
-        self.log_test_result(
+        return (
             "Evening Discovery Journey",
             all_successful,
             {
                 "steps_completed": len([s for s in journey_steps if s["success"]]),
                 "total_steps": len(journey_steps),
                 "journey_details": journey_steps
-            },
-            "user_journeys"
+            }
         )
     
     # =========================================================================
     # PERFORMANCE AND STRESS TESTS
     # =========================================================================
     
-    def test_adk_response_times(self):
+    async def test_adk_response_times(self):
         """Test ADK agent response times under normal load"""
-        response_times = []
-        
-        for i in range(5):
-            chat_data = {
+        base_lat, base_lng = self.PERF_BASE_LOCATION["lat"], self.PERF_BASE_LOCATION["lng"]
+        payloads = [
+            {
                 "user_id": f"perf_test_user_{i}",
-                "message": f"Test message {i}: How is traffic in area {i}?",
-                "location": {"lat": 12.9716 + (i * 0.01), "lng": 77.5946 + (i * 0.01)}
+                "message": self.PERF_MESSAGE_TEMPLATE.format(i=i),
+                "location": {"lat": base_lat + (i * 0.01), "lng": base_lng + (i * 0.01)}
             }
-            
-            result = self.make_request("POST", "/adk/chat", chat_data)
-            if result["success"]:
-                response_times.append(result["response_time_ms"])
+            for i in range(self.PERF_REQUESTS)
+        ]
+        
+        # Send the requests concurrently so the timings reflect load, not a serial loop
+        results = await asyncio.gather(*(
+            self.make_request("POST", "/adk/chat", chat_data) for chat_data in payloads
+        ))
+        response_times = [result["response_time_ms"] for result in results if result["success"]]
         
         avg_response_time = sum(response_times) / len(response_times) if response_times else 0
         max_response_time = max(response_times) if response_times else 0
@@ -541,86 +579,88 @@ class ADKAgentTester:
         # Consider successful if average response time is under 5 seconds
         success = avg_response_time < 5000 and len(response_times) >= 4
         
-        self.performance_metrics["adk_response_times"] = {
+        self.test_results["performance_metrics"]["adk_response_times"] = {
             "average_ms": avg_response_time,
             "max_ms": max_response_time,
             "successful_requests": len(response_times),
-            "total_requests": 5
+            "total_requests": self.PERF_REQUESTS
         }
         
         self.log_test_result(
             "ADK Response Time Performance",
             success,
-            self.performance_metrics["adk_response_times"]
+            self.test_results["performance_metrics"]["adk_response_times"]
         )
     
     # =========================================================================
     # MAIN TEST RUNNER
     # =========================================================================
     
-    def run_all_tests(self):
+    async def run_all_tests(self):
         """Run all ADK agent tests"""
         logger.info("🚀 Starting Google ADK Agent Test Suite")
         logger.info("=" * 60)
         
-        # Check if server is running
-        health_check = self.make_request("GET", "/health")
+        # Check if server is running (the suite's only /health probe)
+        health_check = await self.make_request("GET", "/health", timeout=5)
         if not health_check["success"]:
-            logger.error("❌ Server is not running. Please start the server first.")
+            logger.error("❌ Server is not running. Please start the server with: python3 main.py")
             return False
         
         logger.info("✅ Server is running. Starting tests...")
         logger.info("")
         
+        # Every single-request test goes out in one batch
+        names = list(self.SINGLE_REQUEST_TESTS)
+        batch_results = await asyncio.gather(*(
+            self.make_request(*self.SINGLE_REQUEST_TESTS[name]) for name in names
+        ))
+        results = dict(zip(names, batch_results))
+        
         # 1. ADK Installation and Setup Tests
         logger.info("📋 1. ADK Installation and Setup Tests")
         logger.info("-" * 40)
-        adk_available = self.test_adk_installation_status()
+        adk_available = self.check_adk_installation_status(results["adk_installation_status"])
         if adk_available:
-            self.test_adk_agents_info()
+            self.check_adk_agents_info(results["adk_agents_info"])
         else:
             logger.warning("⚠️  Google ADK not available. Some tests will be skipped.")
         logger.info("")
         
-        # 2. ADK Conversation Tests
-        logger.info("💬 2. ADK Conversation Tests")
-        logger.info("-" * 40)
-        self.test_adk_chat_basic()
-        self.test_adk_chat_context_aware()
-        self.test_adk_conversation_history()
-        logger.info("")
-        
-        # 3. ADK Dashboard Tests
-        logger.info("📊 3. ADK Dashboard Tests")
-        logger.info("-" * 40)
-        self.test_adk_dashboard_generation()
-        self.test_adk_dashboard_filtering()
-        logger.info("")
-        
-        # 4. ADK Insights Tests
-        logger.info("🔍 4. ADK Insights Tests")
-        logger.info("-" * 40)
-        self.test_adk_insights_generation()
-        logger.info("")
-        
-        # 5. Comparison Tests
-        logger.info("⚖️  5. Comparison Tests (ADK vs Original)")
+        # 2-5. Conversation, dashboard, insights and comparison tests
+        logger.info("💬 2-5. ADK Conversation, Dashboard, Insights and Comparison Tests")
         logger.info("-" * 40)
-        self.test_compare_chat_performance()
-        self.test_compare_dashboard_performance()
+        self.check_adk_chat_basic(results["adk_chat_basic"])
+        self.check_adk_dashboard_generation(results["adk_dashboard_generation"])
+        self.check_adk_dashboard_filtering(results["adk_dashboard_filtering"])
+        self.check_adk_insights_generation(results["adk_insights_generation"])
+        
+        # Multi-request tests use separate users, so they run concurrently;
+        # each keeps its own requests in order
+        await asyncio.gather(
+            self.test_adk_chat_context_aware(),
+            self.test_adk_conversation_history(),
+            self.test_compare_chat_performance(),
+            self.test_compare_dashboard_performance()
+        )
         logger.info("")
         
-        # 6. User Journey Tests
+        # 6. User Journey Tests - each journey has its own user, so they run side by
+        # side; results are logged afterwards so the report order stays fixed
         logger.info("👤 6. User Journey Tests")
         logger.info("-" * 40)
-        self.test_user_journey_morning_commute()
-        self.test_user_journey_evening_discovery()
+        journey_results = await asyncio.gather(
+            self.test_user_journey_morning_commute(),
+            self.test_user_journey_evening_discovery()
+        )
+        for test_name, success, details in journey_results:
+            self.log_test_result(test_name, success, details, "user_journeys")
         logger.info("")
         
         # 7. Performance Tests
         logger.info("⚡ 7. Performance Tests")
         logger.info("-" * 40)
-        self.test_adk_response_times()
+        await self.test_adk_response_times()
         logger.info("")
         
         # Generate summary
@@ -635,55 +675,49 @@ class ADKAgentTester:
         # Count results by category
         categories = ["adk_tests", "comparison_tests", "user_journeys"]
         
+        total_tests = total_passed = 0
         for category in categories:
-            tests = self.test_results[category]
-            total = len(tests)
-            passed = len([t for t in tests if t["success"]])
-            failed = total - passed
+            passed, failed = self.tally[category]
+            total = passed + failed
+            total_tests += total
+            total_passed += passed
             
-            category_name = category.replace("_", " ").title()
-            logger.info(f"{category_name}: {passed}/{total} passed")
+            logger.info("%s: %d/%d passed", category.replace("_", " ").title(), passed, total)
             
-            if failed > 0:
-                logger.info(f"  Failed tests:")
-                for test in tests:
-                    if not test["success"]:
-                        logger.info(f"    - {test['test_name']}")
+            if failed > 0 and logger.isEnabledFor(logging.INFO):
+                logger.info("  Failed tests:")
+                for test in (t for t in self.test_results[category] if not t["success"]):
+                    logger.info("    - %s", test['test_name'])
         
         # Overall summary
-        all_tests = []
-        for category in categories:
-            all_tests.extend(self.test_results[category])
-        
-        total_tests = len(all_tests)
-        total_passed = len([t for t in all_tests if t["success"]])
         success_rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
         
         logger.info("")
-        logger.info(f"🎯 OVERALL RESULTS")
-        logger.info(f"Total Tests: {total_tests}")
-        logger.info(f"Passed: {total_passed}")
-        logger.info(f"Failed: {total_tests - total_passed}")
-        logger.info(f"Success Rate: {success_rate:.1f}%")
+        logger.info("🎯 OVERALL RESULTS")
+        logger.info("Total Tests: %d", total_tests)
+        logger.info("Passed: %d", total_passed)
+        logger.info("Failed: %d", total_tests - total_passed)
+        logger.info("Success Rate: %.1f%%", success_rate)
         
         # Performance metrics
-        if self.performance_metrics:
+        if self.test_results["performance_metrics"] and logger.isEnabledFor(logging.INFO):
             logger.info("")
             logger.info("⚡ PERFORMANCE METRICS")
-            for metric_name, metrics in self.performance_metrics.items():
-                logger.info(f"{metric_name}:")
+            for metric_name, metrics in self.test_results["performance_metrics"].items():
+                logger.info("%s:", metric_name)
                 for key, value in metrics.items():
-                    logger.info(f"  {key}: {value}")
+                    logger.info("  %s: %s", key, value)
         
         # Save detailed results
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         results_file = f"adk_test_results_{timestamp}.json"
         
-        with open(results_file, 'w') as f:
-            json.dump(self.test_results, f, indent=2, default=str)
+        # Serialize and write off the critical path; run_suite joins before exiting
+        self.results_writer = threading.Thread(target=write_json_file, args=(results_file, self.test_results))
+        self.results_writer.start()
         
         logger.info("")
-        logger.info(f"📄 Detailed results saved to: {results_file}")
+        logger.info("📄 Detailed results saved to: %s", results_file)
         logger.info("🏁 Testing completed!")
 
 
@@ -699,21 +733,18 @@ def main():
     print("5. Measure performance metrics")
     print("")
     
-    # Check if server is running
-    try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
-        if response.status_code != 200:
-            print("❌ Server is not running or not healthy")
-            print("Please start the server with: python3 main.py")
-            return
-    except Exception:
-        print("❌ Cannot connect to server")
-        print("Please start the server with: python3 main.py")
-        return
-    
-    # Run tests
-    tester = ADKAgentTester()
-    tester.run_all_tests()
+    # Run tests (run_all_tests checks that the server is up first)
+    asyncio.run(run_suite())
+
+
+async def run_suite():
+    """Run the suite on one shared HTTP session"""
+    async with ADKAgentTester() as tester:
+        await tester.run_all_tests()
+    
+    # Make sure the results file is fully written before exiting
+    if tester.results_writer:
+        tester.results_writer.join()
 
 
 if __name__ == "__main__":
@@ -15,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from data.database.user_manager import user_data_manager
 from data.models.schemas import Coordinates, EventTopic
+from data.event_loop import run_main
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -71,21 +72,20 @@ async def test_user_data_layer():
         # 4. Set home and work locations
         print("\n4. Setting Home and Work Locations...")
         
-        # Set home location
-        home_success = await user_data_manager.set_home_location(
+        # Both locations live on the user document, so write them together
+        locations_success = await user_data_manager.set_locations(
             user_id=user.id,
-            location=Coordinates(lat=12.9352, lng=77.6245),  # Koramangala
-            address="Koramangala 5th Block, Bengaluru, Karnataka"
-        )
-        
-        # Set work location  
-        work_success = await user_data_manager.set_work_location(
-            user_id=user.id,
-            location=Coordinates(lat=12.9698, lng=77.7499),  # Whitefield
-            address="Whitefield IT Park, Bengaluru, Karnataka"
+            home=(
+                Coordinates(lat=12.9352, lng=77.6245),  # Koramangala
+                "Koramangala 5th Block, Bengaluru, Karnataka"
+            ),
+            work=(
+                Coordinates(lat=12.9698, lng=77.7499),  # Whitefield
+                "Whitefield IT Park, Bengaluru, Karnataka"
+            )
         )
         
-        if home_success and work_success:
+        if locations_success:
             print("✅ Home and work locations set successfully")
         else:
             print("❌ Failed to set home/work locations")
@@ -99,18 +99,18 @@ async def test_user_data_layer():
             ("flooding near Silk Board", EventTopic.WEATHER)
         ]
         
-        for query, topic in interactions:
-            interaction_success = await user_data_manager.track_user_interaction(
-                user_id=user.id,
-                topic=topic,
-                query=query,
-                location=test_location
-            )
-            
-            if interaction_success:
+        # Record all interactions in one batched write
+        interactions_success = await user_data_manager.track_user_interactions(
+            user_id=user.id,
+            interactions=interactions,
+            location=test_location
+        )
+        
+        if interactions_success:
+            for query, _ in interactions:
                 print(f"✅ Tracked interaction: {query}")
-            else:
-                print(f"❌ Failed to track interaction: {query}")
+        else:
+            print(f"❌ Failed to track {len(interactions)} interactions")
         
         # 6. Get user insights
         print("\n6. Getting User Insights...")
@@ -128,15 +128,18 @@ async def test_user_data_layer():
         # 7. Test user retrieval
         print("\n7. Testing User Retrieval...")
         
-        # Get by ID
-        retrieved_user = await user_data_manager.get_user(user.id)
+        # ID and email lookups are independent; they overlap once the manager
+        # reads Firestore (the current mock returns without awaiting)
+        retrieved_user, retrieved_by_email = await asyncio.gather(
+            user_data_manager.get_user(user.id),
+            user_data_manager.get_user_by_email("test.user@example.com")
+        )
+        
         if retrieved_user:
             print(f"✅ Retrieved user by ID: {retrieved_user.profile.name}")
         else:
             print("❌ Failed to retrieve user by ID")
         
-        # Get by email
-        retrieved_by_email = await user_data_manager.get_user_by_email("test.user@example.com")
         if retrieved_by_email:
             print(f"✅ Retrieved user by email: {retrieved_by_email.profile.name}")
         else:
@@ -187,4 +190,4 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())